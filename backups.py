@@ -0,0 +1,257 @@
+"""
+Copias de seguridad en caliente de las bases SQLite y de la carpeta uploads/.
+
+Cada copia es una carpeta BACKUP_DIR/AAAAMMDD-HHMMSS/ con las bases
+(copiadas con la API de backup de SQLite y verificadas con integrity_check)
+y manifest.json. Los adjuntos se copian una sola vez a BACKUP_DIR/uploads/
+(se guardan por contenido y no cambian); el manifiesto de cada copia lista
+los archivos nuevos desde la anterior. Para restaurar: detener la app,
+copiar las bases de la carpeta elegida y el contenido de BACKUP_DIR/uploads/
+a uploads/ y correr `flask --app app generate-previews`.
+
+Como thumbnails.py, no importa app.py: recibe las rutas.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+MANIFEST = "manifest.json"
+
+# Carpeta (dentro de BACKUP_DIR) con la copia acumulada de uploads/
+UPLOADS_MIRROR = "uploads"
+
+# Nombre de cada copia: se ordena por fecha
+SNAPSHOT_FORMAT = "%Y%m%d-%H%M%S"
+
+# Carpetas de uploads/ que no se copian: temporales, subidas a medias y
+# miniaturas (se regeneran con `flask --app app generate-previews`)
+SKIPPED_UPLOAD_DIRS = {".tmp", ".partes", "previews"}
+
+# Cada cuántos segundos la sonda intenta tomar el lock de escritura
+PROBE_INTERVAL = 0.05
+
+
+def backup_database(source, target, pages, pause, busy_timeout_ms):
+    """
+    Copia la base source en target con la API de backup, de a `pages`
+    páginas y con `pause` segundos entre pasos (para no acaparar el disco).
+    La copia se lee dentro de una transacción de lectura: en modo WAL los
+    escritores no esperan y, como la instantánea no cambia, el backup no
+    vuelve a empezar cada vez que alguien escribe. Devuelve {"pages",
+    "bytes", "seconds"}.
+    """
+    started = time.perf_counter()
+    src = sqlite3.connect(source, isolation_level=None, timeout=busy_timeout_ms / 1000)
+    dst = sqlite3.connect(target, isolation_level=None)
+    total = 0
+
+    def progress(status, remaining, count):
+        nonlocal total
+        total = count
+        if remaining:
+            time.sleep(pause)
+
+    try:
+        src.execute("BEGIN;")
+        src.execute("SELECT COUNT(*) FROM sqlite_master;").fetchone()
+        src.backup(dst, pages=pages, progress=progress)
+        # La copia queda como un archivo suelto, sin -wal
+        dst.execute("PRAGMA journal_mode = DELETE;")
+    finally:
+        src.execute("ROLLBACK;")
+        src.close()
+        dst.close()
+    return {
+        "pages": total,
+        "bytes": os.path.getsize(target),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def integrity_problems(path):
+    """Errores de PRAGMA integrity_check (lista vacía si la base está bien)."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = [row[0] for row in conn.execute("PRAGMA integrity_check(20);")]
+    finally:
+        conn.close()
+    return [] if rows == ["ok"] else rows
+
+
+@contextmanager
+def writer_stall_probe(path, busy_timeout_ms):
+    """
+    Mientras dura el bloque, un hilo toma y suelta el lock de escritura de
+    la base cada PROBE_INTERVAL y anota la espera más larga: lo que habría
+    esperado un técnico al guardar. Entrega un dict con "max_seconds".
+    """
+    result = {"max_seconds": 0.0, "probes": 0}
+    stop = threading.Event()
+
+    def run():
+        conn = sqlite3.connect(
+            path, isolation_level=None, timeout=busy_timeout_ms / 1000
+        )
+        try:
+            while not stop.wait(PROBE_INTERVAL):
+                started = time.perf_counter()
+                try:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    conn.execute("ROLLBACK;")
+                except sqlite3.OperationalError:
+                    pass  # "database is locked": la espera fue todo el timeout
+                waited = time.perf_counter() - started
+                result["max_seconds"] = max(result["max_seconds"], waited)
+                result["probes"] += 1
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=run, name="backup-probe", daemon=True)
+    thread.start()
+    try:
+        yield result
+    finally:
+        stop.set()
+        thread.join()
+
+
+def copy_new_uploads(uploads_dir, mirror_dir):
+    """
+    Copia a mirror_dir los archivos de uploads_dir que todavía no están (o
+    que cambiaron de tamaño o fecha). Devuelve [{"path", "size"}] de los
+    copiados, con rutas relativas a uploads_dir.
+    """
+    copied = []
+    for root, dirs, files in os.walk(uploads_dir):
+        if root == uploads_dir:
+            dirs[:] = [d for d in dirs if d not in SKIPPED_UPLOAD_DIRS]
+        dirs.sort()
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, uploads_dir)
+            target = os.path.join(mirror_dir, relative)
+            stat = os.stat(source)
+            try:
+                current = os.stat(target)
+                if (current.st_size, current.st_mtime_ns) == (
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ):
+                    continue
+            except FileNotFoundError:
+                pass
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(source, target + ".tmp")
+            os.replace(target + ".tmp", target)
+            copied.append({"path": relative.replace(os.sep, "/"), "size": stat.st_size})
+    return copied
+
+
+def list_snapshots(backup_dir):
+    """Nombres de las copias completas, de la más vieja a la más nueva."""
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+    snapshots = []
+    for name in names:
+        try:
+            datetime.strptime(name, SNAPSHOT_FORMAT)
+        except ValueError:
+            continue
+        if os.path.exists(os.path.join(backup_dir, name, MANIFEST)):
+            snapshots.append(name)
+    return sorted(snapshots)
+
+
+def rotate(backup_dir, keep_last, keep_weekly):
+    """
+    Borra las copias viejas: quedan las keep_last más nuevas y la última de
+    cada una de las keep_weekly semanas más recientes. También borra las
+    carpetas de copias que no terminaron. Devuelve los nombres borrados.
+    """
+    snapshots = list_snapshots(backup_dir)
+    keep = set(snapshots[-keep_last:] if keep_last else [])
+    weeks = {}
+    for name in snapshots:
+        week = datetime.strptime(name, SNAPSHOT_FORMAT).isocalendar()[:2]
+        weeks[week] = name  # la última copia de esa semana
+    keep.update(sorted(weeks.values())[-keep_weekly:] if keep_weekly else [])
+
+    removed = [name for name in snapshots if name not in keep]
+    for name in removed:
+        shutil.rmtree(os.path.join(backup_dir, name))
+    for name in os.listdir(backup_dir):
+        if name.endswith(".tmp"):
+            shutil.rmtree(os.path.join(backup_dir, name), ignore_errors=True)
+    return removed
+
+
+def run_backup(
+    databases,
+    uploads_dir,
+    backup_dir,
+    keep_last,
+    keep_weekly,
+    pages,
+    pause,
+    busy_timeout_ms,
+):
+    """
+    Hace una copia completa: databases es {nombre en la copia: ruta} (la
+    primera es la principal, donde se mide la espera de los escritores).
+    Si una base no pasa integrity_check la copia se descarta y se lanza
+    RuntimeError. Devuelve el manifiesto.
+    """
+    started = time.perf_counter()
+    name = datetime.now().strftime(SNAPSHOT_FORMAT)
+    final_dir = os.path.join(backup_dir, name)
+    work_dir = final_dir + ".tmp"
+    os.makedirs(work_dir)
+
+    manifest = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "databases": {},
+        "writer_stall_max_seconds": 0.0,
+    }
+    try:
+        for index, (filename, path) in enumerate(databases.items()):
+            target = os.path.join(work_dir, filename)
+            if index == 0:
+                with writer_stall_probe(path, busy_timeout_ms) as stall:
+                    info = backup_database(path, target, pages, pause, busy_timeout_ms)
+                manifest["writer_stall_max_seconds"] = round(stall["max_seconds"], 4)
+            else:
+                info = backup_database(path, target, pages, pause, busy_timeout_ms)
+            problems = integrity_problems(target)
+            if problems:
+                raise RuntimeError(
+                    f"La copia de {filename} no pasó integrity_check: "
+                    + "; ".join(problems)
+                )
+            manifest["databases"][filename] = dict(info, integrity="ok")
+
+        # Después de las bases: los archivos de sus filas ya están en disco
+        new_files = copy_new_uploads(
+            uploads_dir, os.path.join(backup_dir, UPLOADS_MIRROR)
+        )
+        manifest["uploads"] = {
+            "new_files": new_files,
+            "new_bytes": sum(f["size"] for f in new_files),
+        }
+        manifest["seconds"] = round(time.perf_counter() - started, 3)
+        with open(os.path.join(work_dir, MANIFEST), "w", encoding="utf-8") as out:
+            json.dump(manifest, out, ensure_ascii=False, indent=1)
+        os.replace(work_dir, final_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    manifest["name"] = name
+    manifest["removed"] = rotate(backup_dir, keep_last, keep_weekly)
+    return manifest
@@ -0,0 +1,162 @@
+"""
+Mide cuántas órdenes de trabajo por segundo se guardan cuando muchos
+técnicos envían a la vez: varios procesos (como los workers de gunicorn),
+cada uno con varios hilos, haciendo POST a /m/<sección>/nuevo. Compara el
+hilo escritor de cada worker con el proceso escritor compartido
+(WRITER_SOCKET).
+
+Uso (desde la raíz del repo):
+    python benchmarks/concurrent_submit.py [--workers 4] [--threads 8] [--requests 50]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Un "worker": hilos que envían formularios y devuelven la latencia de cada uno
+CHILD = """
+import json, sys, threading, time
+import app
+app.create_app()
+threads, requests = int(sys.argv[1]), int(sys.argv[2])
+latencies, errors = [], []
+
+def submit():
+    client = app.app.test_client()
+    for i in range(requests):
+        t0 = time.perf_counter()
+        try:
+            r = client.post("/m/VOLCADOR/nuevo", data={
+                "type": "Mantenimiento correctivo",
+                "description": f"prueba de carga {i}",
+                "downtime_min": "5",
+            })
+            ok = r.status_code == 302
+        except Exception as e:
+            ok = False
+        (latencies if ok else errors).append(time.perf_counter() - t0)
+
+workers = [threading.Thread(target=submit) for _ in range(threads)]
+sys.stdin.readline()  # esperar a que todos los procesos estén listos
+for w in workers:
+    w.start()
+for w in workers:
+    w.join()
+print(json.dumps({"latencies": latencies, "errors": len(errors)}))
+"""
+
+
+def flask_cli(env, *args):
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", *args],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def run(env, workers, threads, requests):
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-c", CHILD, str(threads), str(requests)],
+            cwd=ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(workers)
+    ]
+    time.sleep(2)  # que todos terminen de importar app.py
+    t0 = time.perf_counter()
+    for child in children:
+        child.stdin.write("\n")
+        child.stdin.flush()
+    results = [
+        json.loads(child.communicate()[0].strip().splitlines()[-1])
+        for child in children
+    ]
+    elapsed = time.perf_counter() - t0
+
+    latencies = sorted(x for r in results for x in r["latencies"])
+    quantiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    )
+    return {
+        "ok": len(latencies),
+        "errors": sum(r["errors"] for r in results),
+        "per_second": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="por hilo")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_submit_")
+    env = dict(
+        os.environ,
+        DATABASE=os.path.join(workdir, "db.sqlite3"),
+        THUMBNAIL_WORKERS="0",
+        WRITER_SOCKET="",
+    )
+    try:
+        flask_cli(env, "migrate")
+        flask_cli(env, "seed")
+
+        rows = [
+            (
+                "hilo escritor por worker",
+                run(env, args.workers, args.threads, args.requests),
+            )
+        ]
+
+        env["WRITER_SOCKET"] = os.path.join(workdir, "writer.sock")
+        writer = subprocess.Popen(
+            [sys.executable, "-m", "flask", "--app", "app", "writer"],
+            cwd=ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            while not os.path.exists(env["WRITER_SOCKET"]):
+                time.sleep(0.05)
+            rows.append(
+                (
+                    "proceso escritor único",
+                    run(env, args.workers, args.threads, args.requests),
+                )
+            )
+        finally:
+            writer.terminate()
+            writer.wait()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.workers} procesos × {args.threads} hilos × {args.requests} envíos")
+    print(
+        f"{'':28} {'ok':>6} {'errores':>8} {'órdenes/s':>10} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for name, r in rows:
+        print(
+            f"{name:28} {r['ok']:6d} {r['errors']:8d} {r['per_second']:10.0f} "
+            f"{r['p50_ms']:8.1f} {r['p95_ms']:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+"""
+Prueba de carga de las páginas principales sobre datos sintéticos
+(benchmarks/synthetic_data.py): el QR de una sección (/m/<código>), el
+envío del formulario (/m/<código>/nuevo), el tablero de avisos
+(/admin/issues) y /api/sections. Cada escenario corre con el cliente de
+pruebas de Flask y con gunicorn, y reporta p50/p95/p99, requests por
+segundo y sentencias SQL por request (leídas de /metrics). Los resultados
+quedan en benchmarks/results/ para comparar entre commits.
+
+Con --database-url corre sobre PostgreSQL en vez de SQLite. Esa base se
+vacía (DROP SCHEMA public) y se vuelve a llenar para cada servidor: use
+una base solo para pruebas.
+
+Uso (desde la raíz del repo):
+    python benchmarks/load_test.py [--work-orders 100000] [--requests 400]
+    python benchmarks/load_test.py --database-url postgresql://localhost/carga
+    python benchmarks/load_test.py --compare benchmarks/results/<anterior>.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+# (escenario, endpoint de Flask en /metrics, ¿necesita sesión admin?)
+SCENARIOS = [
+    ("qr_seccion", "section_view", False),
+    ("nueva_orden", "new_work_order", False),
+    ("avisos", "admin_issues", True),
+    ("api_secciones", "api_sections", False),
+]
+
+# Contraseña admin de los servidores que levanta esta prueba
+ADMIN_PASSWORD = "carga"
+
+
+def scenario_request(name, rng, codes):
+    """(método, ruta, formulario) de un request del escenario."""
+    code = rng.choice(codes)
+    if name == "qr_seccion":
+        return "GET", f"/m/{code}", None
+    if name == "nueva_orden":
+        form = {
+            "type": rng.choice(["Mantenimiento preventivo", "Aviso de desperfecto"]),
+            "failure_type": "Falla mecánica",
+            "description": "prueba de carga",
+            "downtime_min": "5",
+        }
+        return "POST", f"/m/{code}/nuevo", form
+    if name == "avisos":
+        return "GET", "/admin/issues", None
+    return "GET", "/api/sections?key=123456", None
+
+
+# -------------------------------------------------
+#  CLIENTES: CLIENTE DE PRUEBAS DE FLASK O HTTP REAL
+# -------------------------------------------------
+def flask_client_session(admin):
+    """send(método, ruta, formulario) -> (código, cuerpo) con el test client."""
+    import app
+
+    client = app.app.test_client()
+    if admin:
+        with client.session_transaction() as session:
+            session["is_admin"] = True
+
+    def send(method, path, form=None):
+        response = client.open(path, method=method, data=form)
+        return response.status_code, response.get_data()
+
+    return send
+
+
+def http_session(port, admin):
+    """Lo mismo sobre una conexión HTTP persistente (keep-alive) a gunicorn."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    cookies = {}
+
+    def send(method, path, form=None):
+        headers = dict(cookies)
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError):
+            # gunicorn cerró la conexión inactiva (keep-alive vencido)
+            conn.close()
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+        data = response.read()
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            cookies["Cookie"] = cookie.split(";", 1)[0]
+        return response.status, data
+
+    if admin:
+        send("POST", "/admin/login", {"password": ADMIN_PASSWORD})
+    return send
+
+
+# -------------------------------------------------
+#  ESCENARIOS
+# -------------------------------------------------
+_SQL_LINE = re.compile(
+    r'^sql_statements_per_request_(sum|count)\{endpoint="([^"]+)"\} (\S+)$', re.M
+)
+
+
+def sql_totals(metrics_text):
+    """{endpoint: [suma, cantidad]} del histograma de sentencias por request."""
+    totals = {}
+    for kind, endpoint, value in _SQL_LINE.findall(metrics_text):
+        totals.setdefault(endpoint, [0.0, 0.0])[kind == "count"] = float(value)
+    return totals
+
+
+def run_scenarios(new_session, requests, threads, seed):
+    """Corre cada escenario con varios hilos a la vez y devuelve sus resultados."""
+    probe = new_session(False)
+    codes = [s["code"] for s in json.loads(probe("GET", "/api/sections?key=123456")[1])]
+    results = {}
+    for name, endpoint, admin in SCENARIOS:
+        sessions = [new_session(admin) for _ in range(threads)]
+        before = sql_totals(probe("GET", "/metrics")[1].decode())
+        latencies, errors = [], []
+
+        def worker(index):
+            rng = random.Random(f"{seed}-{name}-{index}")
+            for _ in range(requests // threads):
+                method, path, form = scenario_request(name, rng, codes)
+                t0 = time.perf_counter()
+                try:
+                    status = sessions[index](method, path, form)[0]
+                except (OSError, http.client.HTTPException):
+                    status = None
+                elapsed = time.perf_counter() - t0
+                (latencies if status in (200, 302) else errors).append(elapsed)
+
+        pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+        t0 = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - t0
+
+        # Con gunicorn cada worker guarda sus métricas como máximo cada segundo
+        time.sleep(1.1)
+        after = sql_totals(probe("GET", "/metrics")[1].decode())
+        old = before.get(endpoint, [0.0, 0.0])
+        new = after.get(endpoint, [0.0, 0.0])
+        sql_count = new[1] - old[1]
+        results[name] = {
+            **percentiles(latencies),
+            "ok": len(latencies),
+            "errors": len(errors),
+            "per_second": len(latencies) / elapsed,
+            "sql_per_request": (new[0] - old[0]) / sql_count if sql_count else None,
+        }
+    return results
+
+
+def percentiles(latencies):
+    quantiles = (
+        statistics.quantiles(sorted(latencies), n=100)
+        if len(latencies) > 1
+        else [0] * 99
+    )
+    return {
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+# -------------------------------------------------
+#  SERVIDORES
+# -------------------------------------------------
+def run_test_client(env, workdir, args):
+    """Escenarios con el cliente de pruebas, en un proceso nuevo (sin cachés)."""
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", *_child_args(args)],
+        cwd=workdir,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _child_args(args):
+    return [
+        "--requests",
+        str(args.requests),
+        "--threads",
+        str(args.threads),
+        "--seed",
+        str(args.seed),
+    ]
+
+
+def generate_data(env, workdir, args):
+    """Llena la base de env (DATABASE o DATABASE_URL) con datos sintéticos."""
+    if env.get("DATABASE_URL"):
+        import psycopg
+
+        with psycopg.connect(env["DATABASE_URL"], autocommit=True) as conn:
+            conn.execute("DROP SCHEMA IF EXISTS public CASCADE;")
+            conn.execute("CREATE SCHEMA public;")
+    t0 = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            os.path.join(ROOT, "benchmarks", "synthetic_data.py"),
+            "--work-orders",
+            str(args.work_orders),
+            "--sections",
+            str(args.sections),
+            "--seed",
+            str(args.seed),
+            "--end",
+            "2025-01-01",
+        ],
+        cwd=workdir,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+    print(f"Datos sintéticos: {time.perf_counter() - t0:.1f} s")
+
+
+def child_main(args):
+    sys.path.insert(0, ROOT)
+    import app
+
+    app.create_app()
+    results = run_scenarios(
+        flask_client_session, args.requests, args.threads, args.seed
+    )
+    print(json.dumps(results))
+
+
+def run_gunicorn(env, workdir, args):
+    """Escenarios por HTTP contra gunicorn con --gunicorn-workers procesos."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            os.path.join(ROOT, "gunicorn.conf.py"),
+            "--workers",
+            str(args.gunicorn_workers),
+            "--threads",
+            str(args.threads),
+            "--bind",
+            f"127.0.0.1:{port}",
+            "app:create_app()",
+        ],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("gunicorn no arrancó")
+                time.sleep(0.1)
+        return run_scenarios(
+            lambda admin: http_session(port, admin),
+            args.requests,
+            args.threads,
+            args.seed,
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+# -------------------------------------------------
+#  RESULTADOS
+# -------------------------------------------------
+def git_revision():
+    def git(*cmd):
+        return subprocess.run(
+            ["git", *cmd], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+
+    return git("rev-parse", "--short", "HEAD") or "sin-git", bool(
+        git("status", "--porcelain", "--untracked-files=no")
+    )
+
+
+def print_results(results, previous=None):
+    header = (
+        f"{'':28} {'ok':>5} {'err':>4} {'req/s':>7} "
+        f"{'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'SQL/req':>7}"
+    )
+    for server, scenarios in results.items():
+        print(f"\n{server}")
+        print(header)
+        for name, r in scenarios.items():
+            sql = r["sql_per_request"]
+            print(
+                f"  {name:26} {r['ok']:5d} {r['errors']:4d} {r['per_second']:7.0f} "
+                f"{r['p50_ms']:7.1f} {r['p95_ms']:7.1f} {r['p99_ms']:7.1f} "
+                f"{sql if sql is not None else float('nan'):7.1f}"
+            )
+            old = ((previous or {}).get(server) or {}).get(name)
+            if old:
+                print(
+                    f"  {'  vs. anterior':26} {'':5} {'':4} "
+                    f"{_change(r['per_second'], old['per_second']):>7} "
+                    f"{_change(r['p50_ms'], old['p50_ms']):>7} "
+                    f"{_change(r['p95_ms'], old['p95_ms']):>7} "
+                    f"{_change(r['p99_ms'], old['p99_ms']):>7}"
+                )
+
+
+def _change(new, old):
+    return f"{(new - old) / old * 100:+.0f}%" if old else ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--work-orders", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--requests", type=int, default=400, help="por escenario")
+    parser.add_argument("--threads", type=int, default=4, help="clientes a la vez")
+    parser.add_argument("--gunicorn-workers", type=int, default=2)
+    parser.add_argument(
+        "--server", choices=["test-client", "gunicorn", "ambos"], default="ambos"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--database-url",
+        default="",
+        help="PostgreSQL de prueba (se borra su contenido); vacío: SQLite",
+    )
+    parser.add_argument(
+        "--compare", metavar="JSON", help="resultado anterior contra el que comparar"
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="bench_load_")
+    base_db = os.path.join(workdir, "base.sqlite3")
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        ADMIN_PASSWORD=ADMIN_PASSWORD,
+        THUMBNAIL_WORKERS="0",
+        WRITER_SOCKET="",
+        METRICS_ENABLED="1",
+        PROFILE_MODE="",
+        DATABASE_URL=args.database_url,
+    )
+    try:
+        if not args.database_url:
+            generate_data(dict(env, DATABASE=base_db), workdir, args)
+
+        servers = {"test-client": run_test_client, "gunicorn": run_gunicorn}
+        if args.server != "ambos":
+            servers = {args.server: servers[args.server]}
+        results = {}
+        for server, run in servers.items():
+            # Cada servidor parte de la misma base (los envíos la modifican)
+            database = os.path.join(workdir, f"{server}.sqlite3")
+            server_env = dict(
+                env, DATABASE=database, METRICS_DIR=os.path.join(workdir, server)
+            )
+            if args.database_url:
+                generate_data(server_env, workdir, args)
+            else:
+                shutil.copy(base_db, database)
+            results[server] = run(server_env, workdir, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as fh:
+            previous = json.load(fh)["results"]
+    print_results(results, previous)
+
+    revision, dirty = git_revision()
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(
+        RESULTS_DIR,
+        f"{stamp}-{revision}{'-modificado' if dirty else ''}"
+        f"{'-postgres' if args.database_url else ''}.json",
+    )
+    with open(path, "w") as out:
+        json.dump(
+            {
+                "revision": revision,
+                "modified": dirty,
+                "date": stamp,
+                "backend": "postgres" if args.database_url else "sqlite",
+                "options": {
+                    k: v
+                    for k, v in vars(args).items()
+                    if k not in ("child", "compare", "database_url")
+                },
+                "results": results,
+            },
+            out,
+            indent=2,
+        )
+    print(f"\nResultados guardados en {os.path.relpath(path, ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
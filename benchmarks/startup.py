@@ -0,0 +1,109 @@
+"""
+Mide el arranque en frío de un worker: importar app.py, create_app() y los
+primeros requests (/ y /m/<sección>), con y sin plantillas precompiladas.
+
+Uso (desde la raíz del repo):
+    python benchmarks/startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un proceso nuevo para medir un arranque real (sin módulos en caché)
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.create_app()
+t2 = time.perf_counter()
+client = app.app.test_client()
+assert client.get("/").status_code == 200
+assert client.get("/m/VOLCADOR").status_code == 200
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "first_requests": t3 - t2}))
+"""
+
+
+def run_child(env):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def flask_cli(env, *args):
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", *args],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+    )
+
+
+def measure(env, runs, before_each=None):
+    samples = []
+    for _ in range(runs):
+        if before_each:
+            before_each()
+        samples.append(run_child(env))
+    return {
+        key: statistics.median(s[key] for s in samples) * 1000 for key in samples[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    cache_dir = os.path.join(workdir, "jinja_cache")
+    env = dict(
+        os.environ,
+        DATABASE=os.path.join(workdir, "db.sqlite3"),
+        JINJA_CACHE_DIR=cache_dir,
+        THUMBNAIL_WORKERS="0",
+    )
+    try:
+        flask_cli(env, "seed")
+
+        results = {
+            "sin caché de plantillas": measure(
+                env, args.runs, lambda: shutil.rmtree(cache_dir, ignore_errors=True)
+            ),
+        }
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        flask_cli(env, "compile-templates")
+        results["plantillas precompiladas"] = measure(env, args.runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"Mediana de {args.runs} arranques (ms)")
+    print(
+        f"{'escenario':28} {'import':>8} {'create_app':>11} {'1ros req.':>10} {'total':>8}"
+    )
+    for name, r in results.items():
+        total = sum(r.values())
+        print(
+            f"{name:28} {r['import']:8.1f} {r['create_app']:11.1f} "
+            f"{r['first_requests']:10.1f} {total:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
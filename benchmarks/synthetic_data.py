@@ -0,0 +1,265 @@
+"""
+Llena una base con datos sintéticos para pruebas de carga: secciones,
+subpartes, técnicos, órdenes de trabajo (hasta millones) y adjuntos. Con la
+misma semilla y fecha final genera siempre los mismos datos.
+
+Uso (desde la raíz del repo; usa DATABASE o DATABASE_URL y la carpeta
+uploads/ del directorio actual, como la app):
+    python benchmarks/synthetic_data.py [--work-orders 100000] [--sections 40]
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+import db  # noqa: E402
+from PIL import Image  # noqa: E402
+
+# Proporción de cada tipo de orden (como en la planta: sobre todo preventivos)
+WORK_TYPES = [
+    ("Mantenimiento preventivo", 0.55),
+    ("Mantenimiento correctivo", 0.25),
+    ("Aviso de desperfecto", 0.20),
+]
+FAILURE_TYPES = [
+    "Falla mecánica",
+    "Falla eléctrica",
+    "Falla software",
+    "Falla hardware",
+    "Otros",
+]
+WORDS = (
+    "cambio ajuste limpieza rodamiento correa motor sensor cadena rodillo "
+    "cámara expulsor tablero contactor fusible lubricación tensión ruido "
+    "vibración atasco fruta bins calibración revisión reemplazo cable"
+).split()
+
+# Órdenes por lote de executemany() o COPY (como IMPORT_BATCH_SIZE)
+BATCH_SIZE = 10000
+
+
+def generate(
+    conn,
+    work_orders,
+    sections=40,
+    components=8,
+    technicians=30,
+    attachment_rate=0.05,
+    attachment_files=50,
+    open_rate=0.02,
+    days=730,
+    end=None,
+    seed=1,
+):
+    """
+    Agrega los datos a la base de conn en una transacción. Los índices
+    secundarios y el FTS se reconstruyen al final, como en la importación
+    CSV. Devuelve la cantidad de órdenes insertadas.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    cur = conn.cursor()
+    app._begin_bulk_load(cur)
+    try:
+        section_ids = _add_sections(cur, sections, components)
+        technician_ids = _add_technicians(cur, technicians)
+        files = _store_files(rng, attachment_files) if attachment_rate else []
+
+        last_id = cur.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM work_orders;"
+        ).fetchone()[0]
+        deferred = app._drop_deferred_indexes(cur)
+
+        types = [t for t, _ in WORK_TYPES]
+        weights = [w for _, w in WORK_TYPES]
+        batch_last_id = last_id
+        for start in range(0, work_orders, BATCH_SIZE):
+            count = min(BATCH_SIZE, work_orders - start)
+            batch, attachments = [], []
+            for index in range(count):
+                section_id, section_components = rng.choice(section_ids)
+                moment = end - timedelta(minutes=rng.randrange(days * 24 * 60))
+                when = moment.isoformat(timespec="minutes")
+                work_type = rng.choices(types, weights)[0]
+                resolved = work_type != "Aviso de desperfecto" or (
+                    rng.random() >= open_rate
+                )
+                description = " ".join(rng.choices(WORDS, k=rng.randint(4, 14)))
+                batch.append(
+                    (
+                        section_id,
+                        rng.choice(technician_ids) if rng.random() < 0.9 else None,
+                        when,
+                        work_type,
+                        rng.choice(section_components),
+                        rng.choice(FAILURE_TYPES),
+                        description,
+                        rng.choice((0, 0, 5, 15, 30, 60, 120)),
+                        int(rng.random() < 0.3),
+                        when,
+                        int(resolved),
+                        "reparado" if resolved else None,
+                        (
+                            (moment + timedelta(hours=rng.randint(1, 72))).isoformat(
+                                timespec="minutes"
+                            )
+                            if resolved
+                            else None
+                        ),
+                    )
+                )
+                if files and rng.random() < attachment_rate:
+                    sha256, size, path = rng.choice(files)
+                    attachments.append(
+                        (index, "foto.jpg", "image/jpeg", path, when, sha256, size)
+                    )
+            app._insert_import_batch(cur, batch)
+            # Los ids los asigna la base (en PostgreSQL la secuencia puede
+            # tener huecos): se leen en el orden en que se insertaron
+            ids = [
+                row[0]
+                for row in cur.execute(
+                    "SELECT id FROM work_orders WHERE id > ? ORDER BY id;",
+                    (batch_last_id,),
+                )
+            ]
+            batch_last_id = ids[-1]
+            db.insert_rows(
+                cur,
+                "attachments",
+                [
+                    "work_order_id",
+                    "filename",
+                    "mime_type",
+                    "path",
+                    "created_at",
+                    "sha256",
+                    "size",
+                ],
+                [(ids[index], *rest) for index, *rest in attachments],
+            )
+
+        for sql in deferred:
+            cur.execute(sql)
+        app._index_new_work_orders(cur, last_id)
+        app.rebuild_rollups(cur, after_id=last_id)
+        app.record_change(
+            cur, None, "reload", datetime.now().isoformat(timespec="minutes")
+        )
+        app.bump_reference_version(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    cur.execute("ANALYZE;")
+    return work_orders
+
+
+def _add_sections(cur, count, components):
+    """Secciones SYN001… con sus subpartes. Devuelve [(id, [subpartes])]."""
+    result = []
+    for n in range(1, count + 1):
+        code = f"SYN{n:03d}"
+        cur.execute(
+            "INSERT INTO sections (code, name, description) VALUES (?,?,?) "
+            "ON CONFLICT DO NOTHING;",
+            (code, f"Sección sintética {n}", "Datos de prueba de carga"),
+        )
+        names = [f"Subparte {k}" for k in range(1, components + 1)]
+        if cur.rowcount:
+            cur.executemany(
+                "INSERT INTO components (section_code, name) VALUES (?, ?);",
+                [(code, name) for name in names],
+            )
+        section_id = cur.execute(
+            "SELECT id FROM sections WHERE code = ?;", (code,)
+        ).fetchone()[0]
+        result.append((section_id, names))
+    return result
+
+
+def _add_technicians(cur, count):
+    cur.executemany(
+        "INSERT INTO technicians (name, role, active) VALUES (?, 'Técnico', 1);",
+        [(f"Técnico sintético {n}",) for n in range(1, count + 1)],
+    )
+    return [
+        row[0]
+        for row in cur.execute(
+            "SELECT id FROM technicians WHERE name LIKE 'Técnico sintético %';"
+        )
+    ]
+
+
+def _store_files(rng, count):
+    """Fotos pequeñas de un color guardadas por contenido, como las subidas."""
+    files = []
+    for _ in range(count):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        buffer = io.BytesIO()
+        Image.new("RGB", (640, 480), color).save(buffer, "JPEG", quality=85)
+        buffer.seek(0)
+        files.append(app.store_upload(buffer, "foto.jpg"))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--work-orders", type=int, default=100000)
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--components", type=int, default=8, help="por sección")
+    parser.add_argument("--technicians", type=int, default=30)
+    parser.add_argument(
+        "--attachment-rate", type=float, default=0.05, help="órdenes con foto"
+    )
+    parser.add_argument(
+        "--attachment-files", type=int, default=50, help="fotos distintas"
+    )
+    parser.add_argument(
+        "--open-rate", type=float, default=0.02, help="avisos sin resolver"
+    )
+    parser.add_argument("--days", type=int, default=730, help="historia en días")
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=None,
+        help="fecha de la orden más nueva (AAAA-MM-DD, por defecto hoy)",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app.init_db()
+    app.seed_data()
+    conn = app.connect_db()
+    t0 = time.perf_counter()
+    try:
+        count = generate(
+            conn,
+            args.work_orders,
+            sections=args.sections,
+            components=args.components,
+            technicians=args.technicians,
+            attachment_rate=args.attachment_rate,
+            attachment_files=args.attachment_files,
+            open_rate=args.open_rate,
+            days=args.days,
+            end=args.end,
+            seed=args.seed,
+        )
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - t0
+    where = app.DATABASE if app.DB_BACKEND == db.SQLITE else "PostgreSQL"
+    print(f"✅ {count} órdenes sintéticas en {elapsed:.1f} s ({where})")
+
+
+if __name__ == "__main__":
+    main()
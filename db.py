@@ -0,0 +1,225 @@
+"""
+Acceso a la base de datos: SQLite (archivo local) o PostgreSQL (DATABASE_URL).
+
+app.py escribe el SQL como para sqlite3, con marcadores "?" y ":nombre". En
+PostgreSQL las conexiones de este módulo traducen los marcadores, devuelven
+filas que se leen por nombre o por posición (como sqlite3.Row) y abren la
+transacción solas antes de un INSERT/UPDATE/DELETE, igual que sqlite3.
+
+Como thumbnails.py, no importa app.py. psycopg solo hace falta con
+PostgreSQL.
+"""
+
+import re
+import sqlite3
+import time
+from functools import lru_cache
+
+try:
+    import psycopg
+    import psycopg_pool
+    from psycopg.pq import TransactionStatus
+except ImportError:  # solo se usa con PostgreSQL
+    psycopg = psycopg_pool = None
+
+SQLITE = "sqlite"
+POSTGRES = "postgres"
+
+# Se llama con los segundos de cada sentencia en PostgreSQL (métricas de app.py)
+on_statement = None
+
+# Errores de cualquiera de los dos motores
+Error = (sqlite3.Error, psycopg.Error) if psycopg else (sqlite3.Error,)
+
+_PLACEHOLDER_RE = re.compile(r"(?<!:):([A-Za-z_]\w*)|\?")
+_BEGIN_IMMEDIATE_RE = re.compile(r"\s*BEGIN\s+IMMEDIATE\b", re.IGNORECASE)
+_WRITE_RE = re.compile(r"\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def backend(url):
+    """POSTGRES si la URL es de PostgreSQL; SQLITE si está vacía."""
+    if not url:
+        return SQLITE
+    if url.startswith(("postgres://", "postgresql://")):
+        return POSTGRES
+    raise ValueError(f"DATABASE_URL no es de PostgreSQL: {url}")
+
+
+@lru_cache(maxsize=1024)
+def translate(sql, with_params=True):
+    """
+    SQL de sqlite3 a psycopg: "?" → %s, ":nombre" → %(nombre)s y BEGIN
+    IMMEDIATE → BEGIN. Los literales del SQL no deben contener "?" ni
+    ":nombre" (los valores van siempre como parámetros).
+    """
+    if _BEGIN_IMMEDIATE_RE.match(sql):
+        return "BEGIN"
+    if not with_params:
+        return sql  # sin parámetros psycopg no interpreta los "%"
+    return _PLACEHOLDER_RE.sub(
+        lambda m: f"%({m.group(1)})s" if m.group(1) else "%s",
+        sql.replace("%", "%%"),
+    )
+
+
+class Row:
+    """Fila de PostgreSQL que se lee por nombre o por posición, como sqlite3.Row."""
+
+    __slots__ = ("_names", "_values")
+
+    def __init__(self, names, values):
+        self._names = names
+        self._values = values
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._values[self._names[key]]
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def keys(self):
+        return list(self._names)
+
+    def __repr__(self):
+        return f"Row({dict(zip(self._names, self._values))!r})"
+
+
+def _row_factory(cursor):
+    names = {column.name: i for i, column in enumerate(cursor.description or ())}
+    return lambda values: Row(names, values)
+
+
+if psycopg is not None:
+
+    class PgCursor(psycopg.Cursor):
+        """Cursor que acepta el SQL de sqlite3 (ver translate())."""
+
+        def execute(self, query, params=None, **kwargs):
+            started = time.perf_counter()
+            self._implicit_begin(query)
+            try:
+                return super().execute(
+                    translate(query, params is not None), params, **kwargs
+                )
+            finally:
+                if on_statement:
+                    on_statement(time.perf_counter() - started)
+
+        def executemany(self, query, params_seq, **kwargs):
+            started = time.perf_counter()
+            self._implicit_begin(query)
+            try:
+                return super().executemany(translate(query), params_seq, **kwargs)
+            finally:
+                if on_statement:
+                    on_statement(time.perf_counter() - started)
+
+        def _implicit_begin(self, query):
+            # Como sqlite3: una escritura fuera de transacción abre una y
+            # queda pendiente hasta commit() (o rollback() al devolver la
+            # conexión al pool)
+            status = self.connection.info.transaction_status
+            if status == TransactionStatus.IDLE and _WRITE_RE.match(query):
+                super().execute("BEGIN")
+
+    class PgConnection(psycopg.Connection):
+        """Conexión en autocommit con la interfaz de sqlite3 que usa app.py."""
+
+        @property
+        def in_transaction(self):
+            return self.info.transaction_status != TransactionStatus.IDLE
+
+
+def _require_psycopg():
+    if psycopg is None:
+        raise RuntimeError(
+            "Para usar PostgreSQL instale psycopg[binary] y psycopg-pool"
+        )
+
+
+def _pg_options():
+    return {
+        "autocommit": True,
+        "row_factory": _row_factory,
+        "cursor_factory": PgCursor,
+    }
+
+
+def connect_postgres(url):
+    """Conexión nueva a PostgreSQL (fuera del pool: CLI, escritor, SSE)."""
+    _require_psycopg()
+    return PgConnection.connect(url, **_pg_options())
+
+
+def postgres_pool(url, size):
+    """Pool de conexiones para los requests de un worker."""
+    _require_psycopg()
+    return psycopg_pool.ConnectionPool(
+        url,
+        min_size=1,
+        max_size=size,
+        connection_class=PgConnection,
+        kwargs=_pg_options(),
+        name="app",
+        open=True,
+    )
+
+
+def is_sqlite(conn):
+    return isinstance(conn, sqlite3.Connection)
+
+
+def table_exists(conn, name):
+    if is_sqlite(conn):
+        sql = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?;"
+    else:
+        sql = (
+            "SELECT 1 FROM pg_tables "
+            "WHERE schemaname = current_schema() AND tablename = ?;"
+        )
+    return conn.execute(sql, (name,)).fetchone() is not None
+
+
+def insert_rows(cur, table, columns, rows):
+    """
+    Inserta muchas filas de una vez: COPY en PostgreSQL, executemany() en
+    SQLite (que ya reutiliza la sentencia preparada).
+    """
+    names = ", ".join(columns)
+    if isinstance(cur, sqlite3.Cursor):
+        marks = ", ".join("?" * len(columns))
+        cur.executemany(f"INSERT INTO {table} ({names}) VALUES ({marks});", rows)
+        return
+    started = time.perf_counter()
+    with cur.copy(f"COPY {table} ({names}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+    if on_statement:
+        on_statement(time.perf_counter() - started)
+
+
+def iter_batches(conn, sql, params, size):
+    """
+    Recorre el resultado de a `size` filas sin traerlo entero a memoria. En
+    PostgreSQL usa un cursor del servidor, que vive en una transacción de
+    solo lectura que se descarta al terminar.
+    """
+    if is_sqlite(conn):
+        cur = conn.execute(sql, params)
+        while batch := cur.fetchmany(size):
+            yield batch
+        return
+    conn.execute("BEGIN READ ONLY;")
+    try:
+        with conn.cursor(name="lectura") as cur:
+            cur.itersize = size
+            cur.execute(translate(sql, params is not None), params)
+            while batch := cur.fetchmany(size):
+                yield batch
+    finally:
+        conn.rollback()
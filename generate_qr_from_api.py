@@ -1,6 +1,7 @@
-import qrcode
+import qr_labels
 import requests
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 # URL de tu backend online (Render)
 BASE_URL = "https://mantenimiento-qr-pyck.onrender.com"
@@ -12,29 +13,34 @@ API_URL = f"{BASE_URL}/api/sections?key={ADMIN_API_KEY}"
 # Carpeta donde guardar los QR
 OUTPUT_FOLDER = "qr_codes"
 
-# Crear carpeta si no existe
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+# Lado del QR en píxeles
+SIZE = 600
 
-print("📡 Obteniendo máquinas desde el servidor...")
 
-try:
-    sections = requests.get(API_URL).json()
-except Exception as e:
-    print("❌ Error al conectar con el servidor:", e)
-    exit()
+if __name__ == "__main__":
+    # Crear carpeta si no existe
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
-print(f"Encontradas {len(sections)} máquinas/secciones\n")
+    print("📡 Obteniendo máquinas desde el servidor...")
 
-for s in sections:
-    code = s["code"]
-    name = s["name"]
+    try:
+        sections = requests.get(API_URL, timeout=30).json()
+    except Exception as e:
+        print("❌ Error al conectar con el servidor:", e)
+        exit()
 
-    qr_url = f"{BASE_URL}/m/{code}"
-    img = qrcode.make(qr_url)
+    print(f"Encontradas {len(sections)} máquinas/secciones\n")
 
-    filepath = os.path.join(OUTPUT_FOLDER, f"{code}.png")
-    img.save(filepath)
+    # Solo se dibujan los QR nuevos o de secciones que cambiaron
+    jobs = []
+    for s in sections:
+        path = qr_labels.label_path(OUTPUT_FOLDER, s["code"], s["name"], BASE_URL, SIZE)
+        if not os.path.exists(path):
+            jobs.append((s["code"], s["name"], BASE_URL, SIZE, path))
+        print(f"✅ QR → {path} | {qr_labels.section_url(BASE_URL, s['code'])}")
 
-    print(f"✅ QR generado → {filepath} | {qr_url}")
+    if jobs:
+        with ProcessPoolExecutor() as pool:
+            list(pool.map(qr_labels.render_label, *zip(*jobs)))
 
-print("\n🎉 Listo. Todos los QR están en la carpeta 'qr_codes'.")
+    print(f"\n🎉 Listo. {len(jobs)} QR nuevos; todos están en la carpeta 'qr_codes'.")
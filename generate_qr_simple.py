@@ -1,27 +1,47 @@
-import qrcode
+"""
+Genera los QR de las secciones a partir de la base de datos local, sin
+pasar por el servidor. Para una hoja de etiquetas lista para imprimir use
+/admin/qr desde el modo administrador.
+"""
+
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import qr_labels
 
 # ⚠️ USA TU URL ONLINE DE RENDER
 BASE_URL = "https://mantenimiento-qr-pyck.onrender.com/"
 
-sections = [
-    ("VOLCADOR", "Volcador"),
-    ("ELEVADOR", "Elevador de fruta"),
-    ("ACUMULACION", "Acumulación"),
-    ("SINGULACION", "Singulación"),
-    ("ACELERACION", "Aceleración"),
-    ("TECHMODULE", "Tech Module"),
-    ("SELECTIONMODULE", "Selection Module"),
-    ("CADENAS", "Cadenas y rollers"),
-    ("TABLEROS", "Tableros eléctricos"),
-]
-
-print("Generando códigos QR...")
-
-for code, name in sections:
-    url = BASE_URL + code
-    img = qrcode.make(url)
-    filename = f"qr_{code}.png"
-    img.save(filename)
-    print(f"✅ QR generado para {name} ({code}): {filename} -> {url}")
-
-print("🚀 Listo. Los QR están en esta misma carpeta.")
+# Base de datos de donde se leen las secciones
+DATABASE = os.environ.get("DATABASE", "db.sqlite3")
+
+# Lado del QR en píxeles
+SIZE = 600
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect(DATABASE)
+    sections = conn.execute("SELECT code, name FROM sections ORDER BY id;").fetchall()
+    conn.close()
+
+    print(f"Generando {len(sections)} códigos QR...")
+
+    paths = [f"qr_{code}.png" for code, _ in sections]
+    with ProcessPoolExecutor() as pool:
+        list(
+            pool.map(
+                qr_labels.render_label,
+                [code for code, _ in sections],
+                [name for _, name in sections],
+                [BASE_URL] * len(sections),
+                [SIZE] * len(sections),
+                paths,
+            )
+        )
+
+    for (code, name), path in zip(sections, paths):
+        url = qr_labels.section_url(BASE_URL, code)
+        print(f"✅ QR generado para {name} ({code}): {path} -> {url}")
+
+    print("🚀 Listo. Los QR están en esta misma carpeta.")
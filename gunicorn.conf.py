@@ -0,0 +1,47 @@
+"""
+Configuración de gunicorn (la carga sola al arrancar desde la raíz del repo).
+
+Con WRITER_SOCKET definido, el proceso maestro inicia el escritor único
+(`flask --app app writer`) antes que los workers y lo detiene al salir. Con
+BACKUP_INTERVAL_HOURS, igual con el programador de copias de seguridad
+(`flask --app app backup --schedule`), y con SMTP_HOST + NOTIFY_EMAIL_TO o
+NOTIFY_WEBHOOKS con el despachador de notificaciones (`flask --app app notify`).
+"""
+
+import os
+import subprocess
+import sys
+
+_writer = None
+_backups = None
+_notify = None
+
+
+def on_starting(server):
+    global _writer, _backups, _notify
+    if os.environ.get("WRITER_SOCKET"):
+        _writer = subprocess.Popen(
+            [sys.executable, "-m", "flask", "--app", "app", "writer"]
+        )
+    if float(os.environ.get("BACKUP_INTERVAL_HOURS", "0")) > 0:
+        _backups = subprocess.Popen(
+            [sys.executable, "-m", "flask", "--app", "app", "backup", "--schedule"]
+        )
+    # Mismos canales que NOTIFY_CHANNELS en app.py: sin destinatarios no se
+    # envían correos y notify terminaría con error
+    smtp_host = os.environ.get("SMTP_HOST")
+    recipients = os.environ.get("NOTIFY_EMAIL_TO", "").strip(", ")
+    webhooks = os.environ.get("NOTIFY_WEBHOOKS", "").strip(", ")
+    if smtp_host and not recipients:
+        server.log.warning("SMTP_HOST sin NOTIFY_EMAIL_TO: no se envían correos")
+    if (smtp_host and recipients) or webhooks:
+        _notify = subprocess.Popen(
+            [sys.executable, "-m", "flask", "--app", "app", "notify"]
+        )
+
+
+def on_exit(server):
+    for process in (_writer, _backups, _notify):
+        if process is not None:
+            process.terminate()
+            process.wait()
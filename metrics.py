@@ -0,0 +1,188 @@
+"""
+Métricas en memoria (contadores e histogramas) en el formato de texto de
+Prometheus, y muestreo de pilas de los requests lentos.
+
+Como thumbnails.py, no importa app.py ni Flask. Con varios workers de
+gunicorn cada proceso deja una copia de sus métricas en una carpeta
+(save_snapshot) y render() las suma.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import Counter
+
+# Límites (segundos) de los histogramas de duración
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Límites de los histogramas de cantidades (sentencias por request, lotes)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Con False, inc() y observe() no hacen nada (métricas desactivadas)
+ENABLED = True
+
+_lock = threading.Lock()
+_definitions = {}  # nombre -> (tipo, ayuda, límites)
+_values = {}  # (nombre, etiquetas) -> número, o conteos por límite + [suma, total]
+
+
+def define(name, kind, help_text, buckets=None):
+    """Declara una métrica ("counter" o "histogram") con su texto de ayuda."""
+    _definitions[name] = (kind, help_text, buckets)
+
+
+def inc(name, value=1, **labels):
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _values[key] = _values.get(key, 0) + value
+
+
+def observe(name, value, **labels):
+    if not ENABLED:
+        return
+    buckets = _definitions[name][2]
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        state = _values.get(key)
+        if state is None:
+            # Un conteo por límite (+Inf al final), luego suma y total
+            state = _values[key] = [0] * (len(buckets) + 3)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                state[i] += 1
+                break
+        else:
+            state[len(buckets)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+
+def _snapshot():
+    with _lock:
+        return [
+            [name, list(labels), list(value) if isinstance(value, list) else value]
+            for (name, labels), value in _values.items()
+        ]
+
+
+def save_snapshot(directory):
+    """Guarda las métricas de este proceso en directory/<pid>.json."""
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as out:
+        json.dump(_snapshot(), out)
+    os.replace(tmp_path, os.path.join(directory, f"{os.getpid()}.json"))
+
+
+def _merged(directory):
+    """Métricas de este proceso más las que otros workers dejaron en directory."""
+    merged = {}
+    snapshots = [_snapshot()]
+    if directory and os.path.isdir(directory):
+        for name in os.listdir(directory):
+            if name.endswith(".json") and name != f"{os.getpid()}.json":
+                try:
+                    with open(os.path.join(directory, name)) as fh:
+                        snapshots.append(json.load(fh))
+                except (OSError, ValueError):
+                    continue  # un worker lo está reemplazando
+    for snapshot in snapshots:
+        for name, labels, value in snapshot:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            if isinstance(value, list):
+                current = merged.setdefault(key, [0] * len(value))
+                merged[key] = [a + b for a, b in zip(current, value)]
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _labels_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render(directory=None):
+    """Texto para Prometheus (formato 0.0.4) con las métricas de todos los workers."""
+    values = _merged(directory)
+    lines = []
+    for name, (kind, help_text, buckets) in sorted(_definitions.items()):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(values.items()):
+            if metric != name:
+                continue
+            if kind == "counter":
+                lines.append(f"{name}{_labels_text(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ["+Inf"], value):
+                cumulative += count
+                le = (("le", bound),)
+                lines.append(f"{name}_bucket{_labels_text(labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels_text(labels)} {value[-2]}")
+            lines.append(f"{name}_count{_labels_text(labels)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+#  MUESTREO DE PILAS DE REQUESTS LENTOS
+# -------------------------------------------------
+# Un hilo mira cada pocos ms qué está ejecutando cada request que ya pasó
+# el umbral. Al terminar, el request recibe sus pilas en formato "folded"
+# (una línea "f1;f2;f3 muestras", el que leen flamegraph.pl y speedscope).
+_active = {}  # id de hilo -> (inicio, umbral, Counter de pilas)
+_sampler_pid = None
+_sampler_lock = threading.Lock()
+
+
+def sampler_begin(threshold, interval):
+    """Empieza a seguir el request del hilo actual (inicia el muestreador)."""
+    global _sampler_pid
+    with _sampler_lock:
+        if _sampler_pid != os.getpid():
+            _sampler_pid = os.getpid()
+            threading.Thread(
+                target=_sample_loop, args=(interval,), name="sampler", daemon=True
+            ).start()
+    _active[threading.get_ident()] = (time.monotonic(), threshold, Counter())
+
+
+def sampler_end():
+    """Deja de seguir el request del hilo actual y devuelve sus pilas."""
+    entry = _active.pop(threading.get_ident(), None)
+    return entry[2] if entry else Counter()
+
+
+def _sample_loop(interval):
+    while True:
+        time.sleep(interval)
+        now = time.monotonic()
+        frames = sys._current_frames()
+        for thread_id, (start, threshold, stacks) in list(_active.items()):
+            frame = frames.get(thread_id)
+            if frame is not None and now - start >= threshold:
+                stacks[_fold(frame)] += 1
+
+
+def _fold(frame):
+    return ";".join(
+        f"{f.name} ({os.path.basename(f.filename)}:{f.lineno})"
+        for f in traceback.extract_stack(frame)
+    )
+
+
+def folded_text(stacks):
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
@@ -0,0 +1,160 @@
+"""
+Envío de avisos de desperfecto por correo (SMTP) y webhooks.
+
+app.py guarda cada aviso en la tabla outbox en la misma transacción que la
+orden de trabajo; el despachador (`flask --app app notify`) los lee, junta
+los de una misma sección en un solo mensaje y los envía con las funciones
+de este módulo. Así el técnico no espera al servidor de correo.
+
+Para probar sin un servidor real: `python -m aiosmtpd -n -l localhost:1025`
+y SMTP_HOST=localhost SMTP_PORT=1025 (imprime los correos que recibe).
+
+Como thumbnails.py, no importa app.py: recibe la configuración.
+"""
+
+import hashlib
+import http.client
+import json
+import random
+import smtplib
+import urllib.error
+import urllib.parse
+import urllib.request
+from email.message import EmailMessage
+
+EMAIL = "email"
+
+# Avisos que se detallan en un mensaje (del resto solo se dice cuántos son)
+MAX_LISTED = 20
+
+# Caracteres de la descripción que entran en el mensaje
+DESCRIPTION_CHARS = 300
+
+
+def webhook_channel(url):
+    """
+    Nombre del canal de un webhook en la columna delivered de outbox: no
+    guarda la URL (puede llevar un token) y no cambia si se reordena la lista.
+    """
+    return "webhook-" + hashlib.sha256(url.encode("utf-8")).hexdigest()[:12]
+
+
+def check_webhook_url(url):
+    """
+    Devuelve la URL si es http(s) con servidor; si no, ValueError (al
+    arrancar, para no descubrirlo recién en el primer aviso).
+    """
+    parts = urllib.parse.urlsplit(url)
+    try:
+        parts.port  # ValueError si no es un número
+    except ValueError:
+        parts = None
+    if (
+        parts is None
+        or parts.scheme not in ("http", "https")
+        or not parts.hostname
+        or any(c.isspace() or not c.isprintable() for c in url)
+    ):
+        raise ValueError(
+            f"NOTIFY_WEBHOOKS: URL inválida {url!r} (use http:// o https://)"
+        )
+    return url
+
+
+def backoff_seconds(attempts, base, maximum):
+    """Espera antes del siguiente intento: exponencial, con tope y al azar (50-100 %)."""
+    delay = min(maximum, base * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def compose(section, reports, base_url=""):
+    """
+    Asunto y texto de un mensaje con los avisos (dicts del payload de
+    outbox, más "technician") de una sección.
+    """
+    count = len(reports)
+    stopped = sum(1 for r in reports if r.get("machine_stopped"))
+    if count == 1:
+        subject = f"⚠ Aviso de desperfecto en {section['name']}"
+    else:
+        subject = f"⚠ {count} avisos de desperfecto en {section['name']}"
+    if stopped:
+        subject += " (máquina detenida)"
+
+    lines = [f"{subject}:", ""]
+    for report in reports[:MAX_LISTED]:
+        part = " / ".join(
+            p for p in (report.get("component"), report.get("failure_type")) if p
+        )
+        header = f"• #{report['id']} {report['date'].replace('T', ' ')}"
+        if part:
+            header += f" — {part}"
+        if report.get("machine_stopped"):
+            header += f" — máquina detenida ({report.get('downtime_min') or 0} min)"
+        lines.append(header)
+        description = report["description"]
+        if len(description) > DESCRIPTION_CHARS:
+            description = description[: DESCRIPTION_CHARS - 1] + "…"
+        lines.append(f"  {description}")
+        if report.get("technician"):
+            lines.append(f"  Reportado por: {report['technician']}")
+    if count > MAX_LISTED:
+        lines.append(f"… y {count - MAX_LISTED} avisos más.")
+    if base_url:
+        lines += ["", f"Avisos pendientes: {base_url.rstrip('/')}/admin/issues"]
+    return subject, "\n".join(lines)
+
+
+def smtp_connect(host, port, user, password, starttls, timeout):
+    """Conexión SMTP lista para enviar (se reutiliza para todos los mensajes de una pasada)."""
+    server = smtplib.SMTP(host, port, timeout=timeout)
+    try:
+        if starttls:
+            server.starttls()
+        if user:
+            server.login(user, password)
+    except (OSError, smtplib.SMTPException):
+        server.close()
+        raise
+    return server
+
+
+def send_email(server, sender, recipients, subject, text):
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(text)
+    server.send_message(message)
+
+
+def post_webhook(url, section, reports, subject, text, timeout):
+    """
+    POST con JSON: "text" (lo muestran Slack, Mattermost, Rocket.Chat y
+    similares) más la sección y los avisos para integraciones propias.
+    Lanza OSError si la respuesta no es 2xx o la URL no sirve.
+    """
+    body = json.dumps(
+        {
+            "text": text,
+            "subject": subject,
+            "section": section,
+            "work_orders": reports,
+        },
+        ensure_ascii=False,
+    ).encode("utf-8")
+    try:
+        request = urllib.request.Request(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json; charset=utf-8"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        raise OSError(f"HTTP {e.code} {e.reason}") from None
+    except (ValueError, http.client.HTTPException) as e:
+        # URL que no sirve (InvalidURL) o respuesta que no es HTTP: como
+        # cualquier otro error de red, se reintenta en vez de cortar el envío
+        raise OSError(f"{type(e).__name__}: {e}") from None
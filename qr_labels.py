@@ -0,0 +1,103 @@
+"""
+Códigos QR de las secciones y hoja de etiquetas para imprimir.
+
+Como thumbnails.py, este módulo no importa app.py: lo usan los procesos
+del pool de QR y los scripts generate_qr_*.py.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+from urllib.parse import quote
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+# Cambiarla invalida las etiquetas guardadas (si cambia el diseño)
+LABEL_VERSION = 1
+
+# Hoja A4 a 150 ppp con 3 × 4 etiquetas por página
+PAGE_SIZE = (1240, 1754)
+PAGE_DPI = 150
+PAGE_MARGIN = 60
+LABEL_GRID = (3, 4)
+
+
+def section_url(base_url, code):
+    """URL que abre el QR: el formulario de la sección (/m/CÓDIGO)."""
+    return base_url.rstrip("/") + "/m/" + quote(code)
+
+
+def label_path(cache_dir, code, name, base_url, size):
+    """
+    Ruta de la etiqueta en la caché. La clave incluye todo lo que se dibuja,
+    así que al renombrar una sección solo cambia (y se regenera) la suya.
+    """
+    key = "\n".join([str(LABEL_VERSION), code, name, base_url, str(size)])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    safe_code = "".join(c if c.isalnum() or c in "-_" else "_" for c in code)
+    return os.path.join(cache_dir, f"{safe_code}-{digest}.png")
+
+
+def render_label(code, name, base_url, size, path):
+    """Dibuja el QR de la sección con su nombre y código debajo (PNG)."""
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_M, border=2)
+    qr.add_data(section_url(base_url, code))
+    qr.make(fit=True)
+    code_img = qr.make_image().convert("L").resize((size, size), Image.NEAREST)
+
+    font = ImageFont.load_default(size=max(12, size // 14))
+    small = ImageFont.load_default(size=max(10, size // 20))
+    caption = size // 4
+    img = Image.new("L", (size, size + caption), 255)
+    img.paste(code_img, (0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.text((size // 2, size + caption // 3), name, fill=0, font=font, anchor="mm")
+    draw.text(
+        (size // 2, size + caption * 3 // 4), code, fill=0, font=small, anchor="mm"
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            img.save(out, "PNG", optimize=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def label_sheet_pdf(paths):
+    """Arma un PDF de varias páginas con las etiquetas en grilla."""
+    columns, rows = LABEL_GRID
+    cell_w = (PAGE_SIZE[0] - 2 * PAGE_MARGIN) // columns
+    cell_h = (PAGE_SIZE[1] - 2 * PAGE_MARGIN) // rows
+    per_page = columns * rows
+
+    pages = []
+    for start in range(0, len(paths), per_page):
+        page = Image.new("L", PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(page)
+        for i, path in enumerate(paths[start : start + per_page]):
+            x = PAGE_MARGIN + (i % columns) * cell_w
+            y = PAGE_MARGIN + (i // columns) * cell_h
+            # Línea de corte alrededor de cada etiqueta
+            draw.rectangle((x, y, x + cell_w, y + cell_h), outline=200)
+            with Image.open(path) as label:
+                label.thumbnail((cell_w - 20, cell_h - 20))
+                page.paste(
+                    label,
+                    (x + (cell_w - label.width) // 2, y + (cell_h - label.height) // 2),
+                )
+        pages.append(page)
+
+    if not pages:
+        pages.append(Image.new("L", PAGE_SIZE, 255))
+    out = io.BytesIO()
+    pages[0].save(
+        out, "PDF", save_all=True, append_images=pages[1:], resolution=PAGE_DPI
+    )
+    return out.getvalue()
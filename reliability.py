@@ -0,0 +1,175 @@
+"""
+Confiabilidad por subparte: intervalos entre avisos de desperfecto (MTBF y
+su distribución), ajuste de Weibull y repetición del mismo tipo de falla.
+
+Todo se calcula con NumPy sobre columnas, para todas las subpartes a la vez
+(sin recorrer fila por fila en Python). Como thumbnails.py, no importa
+app.py: recibe las columnas ya leídas de la base.
+"""
+
+import numpy as np
+
+# Intervalos mínimos para ajustar una Weibull
+WEIBULL_MIN_INTERVALS = 3
+
+# Iteraciones de Newton del ajuste (converge en menos de 20 casi siempre)
+WEIBULL_MAX_ITERATIONS = 50
+
+# Límites del parámetro de forma: fuera de ellos el ajuste no dice nada útil
+WEIBULL_SHAPE_RANGE = (0.05, 50.0)
+
+# Las fechas tienen resolución de minutos: dos avisos en el mismo minuto
+# cuentan como separados por medio minuto (el logaritmo de 0 no existe)
+MIN_INTERVAL_HOURS = 0.5 / 60
+
+# Percentiles de la distribución de intervalos
+PERCENTILES = {"p10_h": 0.10, "median_h": 0.50, "p90_h": 0.90}
+
+
+def component_reliability(
+    section_ids, components, failure_types, dates, recurrence_days=30
+):
+    """
+    Estadísticas por (sección, subparte) a partir de las columnas de los
+    avisos (secuencias del mismo largo, en cualquier orden; fechas ISO).
+    Devuelve un dict por subparte con: failures, intervals, mtbf_h,
+    p10_h / median_h / p90_h, weibull_beta, weibull_eta_h, repeat_rate
+    (intervalos en que se repite el tipo de falla del aviso anterior en
+    menos de recurrence_days), top_failure_type y top_failure_share.
+    Los valores que no se pueden calcular quedan en None.
+    """
+    if len(dates) == 0:
+        return []
+
+    sections = np.asarray(section_ids, dtype=np.int64)
+    component_names, component_codes = np.unique(
+        np.asarray(components, dtype=str), return_inverse=True
+    )
+    type_names, type_codes = np.unique(
+        np.asarray(failure_types, dtype=str), return_inverse=True
+    )
+    minutes = np.asarray(dates, dtype="datetime64[m]").astype(np.int64)
+
+    # Un número de grupo por (sección, subparte)
+    keys, groups = np.unique(
+        np.stack([sections, component_codes]), axis=1, return_inverse=True
+    )
+    groups = groups.ravel()
+    group_count = keys.shape[1]
+
+    # Avisos de cada grupo en orden de fecha; los intervalos son las
+    # diferencias entre avisos consecutivos del mismo grupo
+    order = np.lexsort((minutes, groups))
+    groups, minutes, type_codes = groups[order], minutes[order], type_codes[order]
+    same_group = groups[1:] == groups[:-1]
+    interval_groups = groups[1:][same_group]
+    gaps_min = (minutes[1:] - minutes[:-1])[same_group]
+    gaps = gaps_min / 60.0
+
+    failures = np.bincount(groups, minlength=group_count)
+    intervals = np.bincount(interval_groups, minlength=group_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mtbf = np.bincount(interval_groups, gaps, group_count) / intervals
+
+    percentiles = _group_percentiles(gaps, interval_groups, intervals)
+    beta, eta = _weibull_fit(gaps, interval_groups, intervals, mtbf)
+
+    repeated = (type_codes[1:] == type_codes[:-1])[same_group] & (
+        gaps_min <= recurrence_days * 24 * 60
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        repeat_rate = np.bincount(interval_groups, repeated, group_count) / intervals
+
+    # Tipo de falla más frecuente de cada grupo
+    type_counts = np.bincount(
+        groups * len(type_names) + type_codes, minlength=group_count * len(type_names)
+    ).reshape(group_count, len(type_names))
+    top_type = type_counts.argmax(axis=1)
+    top_share = type_counts.max(axis=1) / failures
+
+    return [
+        {
+            "section_id": int(keys[0, g]),
+            "component": str(component_names[keys[1, g]]),
+            "failures": int(failures[g]),
+            "intervals": int(intervals[g]),
+            "mtbf_h": _value(mtbf[g]),
+            **{name: _value(values[g]) for name, values in percentiles.items()},
+            "weibull_beta": _value(beta[g]),
+            "weibull_eta_h": _value(eta[g]),
+            "repeat_rate": _value(repeat_rate[g]),
+            "top_failure_type": str(type_names[top_type[g]]),
+            "top_failure_share": float(top_share[g]),
+        }
+        for g in range(group_count)
+    ]
+
+
+def _value(x):
+    return None if np.isnan(x) else float(x)
+
+
+def _group_percentiles(values, groups, counts):
+    """Percentiles (interpolación lineal) de values dentro de cada grupo."""
+    ordered = values[np.lexsort((values, groups))]
+    starts = np.cumsum(counts) - counts
+    has_data = counts > 0
+    result = {}
+    for name, q in PERCENTILES.items():
+        out = np.full(len(counts), np.nan)
+        position = starts[has_data] + q * (counts[has_data] - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, starts[has_data] + counts[has_data] - 1)
+        out[has_data] = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+        result[name] = out
+    return result
+
+
+def _weibull_fit(gaps, groups, counts, means):
+    """
+    Weibull de dos parámetros por máxima verosimilitud, con Newton sobre la
+    forma (beta) de todos los grupos a la vez. Devuelve (beta, eta en horas);
+    NaN en los grupos con menos de WEIBULL_MIN_INTERVALS intervalos.
+    """
+    group_count = len(counts)
+    valid = counts >= WEIBULL_MIN_INTERVALS
+    beta = np.full(group_count, np.nan)
+    eta = np.full(group_count, np.nan)
+    if not valid.any():
+        return beta, eta
+
+    use = valid[groups]
+    groups = groups[use]
+    # Escalados por la media del grupo para que x ** beta no desborde
+    scale = np.where(valid & (means > 0), means, 1.0)
+    x = np.maximum(gaps[use], MIN_INTERVAL_HOURS) / scale[groups]
+    log_x = np.log(x)
+    n = np.where(valid, counts, 1)
+    mean_log = np.bincount(groups, log_x, group_count) / n
+
+    # Punto de partida según el coeficiente de variación (Justus)
+    variance = np.bincount(groups, (x - 1.0) ** 2, group_count) / n
+    cv = np.sqrt(variance)
+    with np.errstate(divide="ignore"):
+        b = np.clip(cv**-1.086, *WEIBULL_SHAPE_RANGE)
+
+    for _ in range(WEIBULL_MAX_ITERATIONS):
+        x_b = x ** b[groups]
+        s0 = np.bincount(groups, x_b, group_count)
+        s1 = np.bincount(groups, x_b * log_x, group_count)
+        s2 = np.bincount(groups, x_b * log_x * log_x, group_count)
+        s0 = np.where(valid, s0, 1.0)
+        g = s1 / s0 - 1.0 / b - mean_log
+        dg = (s2 * s0 - s1 * s1) / (s0 * s0) + 1.0 / (b * b)
+        # Pasos amortiguados (a lo sumo duplicar o dividir por dos)
+        step = np.clip(b - g / dg, b / 2, b * 2)
+        step = np.clip(np.where(valid, step, 1.0), *WEIBULL_SHAPE_RANGE)
+        converged = np.all(np.abs(step - b) <= 1e-9 * b)
+        b = step
+        if converged:
+            break
+
+    s0 = np.bincount(groups, x ** b[groups], group_count)
+    beta[valid] = b[valid]
+    eta[valid] = scale[valid] * (s0[valid] / n[valid]) ** (1.0 / b[valid])
+    return beta, eta
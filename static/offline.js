@@ -0,0 +1,233 @@
+// Cola de reportes del modo técnico sin conexión.
+// Los reportes (con sus fotos y videos) se guardan en IndexedDB y se envían
+// todos juntos a /api/sync cuando hay señal; los archivos grandes van antes
+// por partes (resumable.js, que hay que cargar primero). La usan las páginas
+// y el service worker (sw.js), por eso no toca el DOM salvo en init().
+(function (scope) {
+    var DB_NAME = "mantenimiento-offline";
+    var STORE = "reportes";
+    var SYNC_URL = "/api/sync";
+    var BATCH_SIZE = 50;  // debe ser <= SYNC_MAX_RECORDS de app.py
+
+    function openDb() {
+        return new Promise(function (resolve, reject) {
+            var req = indexedDB.open(DB_NAME, 1);
+            req.onupgradeneeded = function () {
+                req.result.createObjectStore(STORE, { keyPath: "key" });
+            };
+            req.onsuccess = function () { resolve(req.result); };
+            req.onerror = function () { reject(req.error); };
+        });
+    }
+
+    // Ejecuta fn(store) en una transacción y resuelve con el resultado del
+    // request que devuelva fn (si devuelve uno).
+    function withStore(mode, fn) {
+        return openDb().then(function (db) {
+            return new Promise(function (resolve, reject) {
+                var tx = db.transaction(STORE, mode);
+                var req = fn(tx.objectStore(STORE));
+                tx.oncomplete = function () {
+                    db.close();
+                    resolve(req ? req.result : undefined);
+                };
+                tx.onerror = tx.onabort = function () {
+                    db.close();
+                    reject(tx.error);
+                };
+            });
+        });
+    }
+
+    function newKey() {
+        if (scope.crypto && crypto.randomUUID) {
+            return crypto.randomUUID();
+        }
+        return Date.now().toString(36) + "-" + Math.random().toString(36).slice(2);
+    }
+
+    // Fecha local AAAA-MM-DDTHH:MM, como la guarda el servidor
+    function localIso(d) {
+        function pad(n) { return (n < 10 ? "0" : "") + n; }
+        return d.getFullYear() + "-" + pad(d.getMonth() + 1) + "-" + pad(d.getDate()) +
+            "T" + pad(d.getHours()) + ":" + pad(d.getMinutes());
+    }
+
+    function queue(record, files) {
+        record.key = record.key || newKey();
+        record.recorded_at = record.recorded_at || localIso(new Date());
+        record.files = files || [];
+        return withStore("readwrite", function (store) {
+            return store.put(record);
+        }).then(function () { return record.key; });
+    }
+
+    function pending() {
+        return withStore("readonly", function (store) { return store.getAll(); });
+    }
+
+    function isLarge(file) {
+        return file.size >= SubidaReanudable.THRESHOLD;
+    }
+
+    // Sube por partes los archivos grandes de los reportes. La dirección de
+    // cada subida queda guardada en el reporte (r.uploads) para retomarla si
+    // se corta la señal, aunque se cierre la página.
+    function uploadLargeFiles(records) {
+        var chain = Promise.resolve();
+        records.forEach(function (r) {
+            r.uploads = r.uploads || {};
+            r.files.forEach(function (file, i) {
+                if (!isLarge(file)) {
+                    return;
+                }
+                chain = chain.then(function () {
+                    return SubidaReanudable.upload(file, {
+                        location: r.uploads[i],
+                        onCreate: function (location) {
+                            r.uploads[i] = location;
+                            return withStore("readwrite", function (store) {
+                                return store.put(r);
+                            });
+                        }
+                    });
+                });
+            });
+        });
+        return chain;
+    }
+
+    function sendBatch(records) {
+        return uploadLargeFiles(records).then(function () {
+            return sendRecords(records);
+        });
+    }
+
+    function sendRecords(records) {
+        var form = new FormData();
+        var payload = records.map(function (r) {
+            var names = [];
+            var uploads = [];
+            r.files.forEach(function (file, i) {
+                if (isLarge(file)) {
+                    uploads.push(r.uploads[i].split("/").pop());
+                    return;
+                }
+                var name = "f_" + r.key + "_" + i;
+                form.append(name, file, file.name || name);
+                names.push(name);
+            });
+            var copy = Object.assign({}, r, { attachments: names, uploads: uploads });
+            delete copy.files;
+            delete copy.error;
+            return copy;
+        });
+        form.append("records", JSON.stringify(payload));
+
+        return fetch(SYNC_URL, { method: "POST", body: form, credentials: "same-origin" })
+            .then(function (resp) {
+                if (!resp.ok) {
+                    throw new Error("HTTP " + resp.status);
+                }
+                return resp.json();
+            })
+            .then(function (data) {
+                var byKey = {};
+                records.forEach(function (r) { byKey[r.key] = r; });
+                return withStore("readwrite", function (store) {
+                    data.results.forEach(function (res) {
+                        if (res.status === "error") {
+                            // Queda guardado (con el motivo) para no perder el reporte
+                            byKey[res.key].error = res.error;
+                            store.put(byKey[res.key]);
+                        } else {
+                            store.delete(res.key);
+                        }
+                    });
+                }).then(function () { return data.results; });
+            });
+    }
+
+    // Envía todos los reportes pendientes, de a BATCH_SIZE por request.
+    // Resuelve con los resultados del servidor; falla si no hay conexión.
+    var running = null;
+    function sync() {
+        if (running) {
+            return running;
+        }
+        running = pending().then(function (records) {
+            records = records.filter(function (r) { return !r.error; });
+            var results = [];
+            var chain = Promise.resolve();
+            for (var i = 0; i < records.length; i += BATCH_SIZE) {
+                (function (batch) {
+                    chain = chain.then(function () {
+                        return sendBatch(batch).then(function (r) {
+                            results = results.concat(r);
+                        });
+                    });
+                })(records.slice(i, i + BATCH_SIZE));
+            }
+            return chain.then(function () { return results; });
+        });
+        running.then(done, done);
+        function done() { running = null; }
+        return running;
+    }
+
+    // Pide al service worker que reintente solo al volver la señal
+    function requestBackgroundSync() {
+        if (!("serviceWorker" in navigator)) {
+            return;
+        }
+        navigator.serviceWorker.ready.then(function (reg) {
+            if (reg.sync) {
+                return reg.sync.register("reportes");
+            }
+        }).catch(function () {});
+    }
+
+    // Registra el service worker, muestra cuántos reportes faltan por enviar
+    // en statusEl y los envía al abrir la página o al recuperar la señal.
+    function init(statusEl, swUrl) {
+        if ("serviceWorker" in navigator) {
+            navigator.serviceWorker.register(swUrl).catch(function () {});
+        }
+
+        function showStatus() {
+            return pending().then(function (records) {
+                var failed = records.filter(function (r) { return r.error; });
+                var waiting = records.length - failed.length;
+                var text = [];
+                if (waiting) {
+                    text.push("⏳ " + waiting + " reporte(s) guardado(s) en el teléfono, pendientes de envío.");
+                }
+                failed.forEach(function (r) {
+                    text.push("❌ No se pudo guardar \"" + r.description.slice(0, 40) + "\": " + r.error);
+                });
+                statusEl.textContent = text.join(" ");
+            });
+        }
+
+        function trySync() {
+            return sync().catch(function () {}).then(showStatus);
+        }
+
+        scope.addEventListener("online", trySync);
+        showStatus().then(function () {
+            if (navigator.onLine) {
+                return trySync();
+            }
+        });
+        return { showStatus: showStatus, trySync: trySync };
+    }
+
+    scope.TecnicoOffline = {
+        CACHE: "tecnico-v2",
+        queue: queue,
+        pending: pending,
+        sync: sync,
+        requestBackgroundSync: requestBackgroundSync,
+        init: init
+    };
+})(self);
@@ -0,0 +1,198 @@
+// Subidas por partes de archivos grandes (protocolo al estilo tus de
+// /subidas en app.py). Si se corta la señal a la mitad de un video, se
+// pregunta al servidor cuántos bytes llegaron y se sigue desde ahí.
+// La usan los formularios y offline.js (también dentro del service worker),
+// por eso no toca el DOM salvo en prepareForm().
+(function (scope) {
+    var CREATE_URL = "/subidas";
+    var PART_SIZE = 4 * 1024 * 1024;  // debe ser <= UPLOAD_PART_MAX_BYTES de app.py
+    var THRESHOLD = 8 * 1024 * 1024;  // archivos más chicos van en el formulario
+    var MAX_RETRIES = 8;
+
+    function b64(text) {
+        return btoa(unescape(encodeURIComponent(text)));
+    }
+
+    function wait(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    function check(resp) {
+        if (!resp.ok) {
+            var error = new Error("HTTP " + resp.status);
+            error.status = resp.status;
+            throw error;
+        }
+        return resp;
+    }
+
+    function create(file) {
+        return fetch(CREATE_URL, {
+            method: "POST",
+            credentials: "same-origin",
+            headers: {
+                "Tus-Resumable": "1.0.0",
+                "Upload-Length": String(file.size),
+                "Upload-Metadata": "filename " + b64(file.name || "archivo") +
+                    ",filetype " + b64(file.type || "application/octet-stream")
+            }
+        }).then(check).then(function (resp) {
+            return resp.headers.get("Location");
+        });
+    }
+
+    // Bytes que ya tiene el servidor (null si la subida no existe o venció)
+    function offsetOf(location) {
+        return fetch(location, {
+            method: "HEAD",
+            credentials: "same-origin",
+            cache: "no-store",
+            headers: { "Tus-Resumable": "1.0.0" }
+        }).then(function (resp) {
+            if (resp.status === 404) {
+                return null;
+            }
+            return parseInt(check(resp).headers.get("Upload-Offset"), 10);
+        });
+    }
+
+    function sendPart(location, file, offset) {
+        return fetch(location, {
+            method: "PATCH",
+            credentials: "same-origin",
+            headers: {
+                "Tus-Resumable": "1.0.0",
+                "Upload-Offset": String(offset),
+                "Content-Type": "application/offset+octet-stream"
+            },
+            body: file.slice(offset, offset + PART_SIZE)
+        }).then(check).then(function (resp) {
+            return parseInt(resp.headers.get("Upload-Offset"), 10);
+        });
+    }
+
+    // Sube file y resuelve con el id de la subida, para el campo "uploads".
+    // options.location retoma una subida anterior; options.onCreate(location)
+    // recibe la dirección de una subida nueva (para guardarla) y
+    // options.onProgress(bytes, total) el avance.
+    function upload(file, options) {
+        options = options || {};
+        var location = options.location || null;
+        var retries = 0;
+
+        function start() {
+            var found = location ? offsetOf(location) : Promise.resolve(null);
+            return found.then(function (offset) {
+                if (offset !== null) {
+                    return offset;
+                }
+                return create(file).then(function (created) {
+                    location = created;
+                    return Promise.resolve(options.onCreate && options.onCreate(created))
+                        .then(function () { return 0; });
+                });
+            });
+        }
+
+        function next(offset) {
+            if (options.onProgress) {
+                options.onProgress(offset, file.size);
+            }
+            if (offset >= file.size) {
+                return location.split("/").pop();
+            }
+            return sendPart(location, file, offset).then(function (newOffset) {
+                retries = 0;
+                return next(newOffset);
+            }, retry);
+        }
+
+        // Sin señal, con la parte rechazada (409) o la subida vencida (404):
+        // esperar y preguntar de nuevo al servidor desde dónde seguir
+        function retry(error) {
+            var fatal = error.status && error.status < 500 &&
+                [404, 409, 423].indexOf(error.status) < 0;
+            if (fatal || retries >= MAX_RETRIES) {
+                throw error;
+            }
+            retries += 1;
+            return wait(Math.min(30000, 1000 * Math.pow(2, retries - 1)))
+                .then(start)
+                .then(next, retry);
+        }
+
+        return start().then(next);
+    }
+
+    // Antes de enviar form, sube por partes los archivos grandes de sus
+    // <input type="file">, los saca del formulario y agrega sus ids en
+    // campos "uploads". statusEl (opcional) muestra el avance.
+    function prepareForm(form, statusEl) {
+        var inputs = Array.prototype.slice.call(form.querySelectorAll("input[type=file]"));
+        var chain = Promise.resolve();
+        // Si un intento anterior falló, sus subidas se retoman (file.subida)
+        Array.prototype.forEach.call(form.querySelectorAll("input[name=uploads]"), function (old) {
+            old.parentNode.removeChild(old);
+        });
+        inputs.forEach(function (input) {
+            var small = new DataTransfer();
+            Array.prototype.forEach.call(input.files, function (file) {
+                if (file.size < THRESHOLD) {
+                    small.items.add(file);
+                    return;
+                }
+                chain = chain.then(function () {
+                    return upload(file, {
+                        location: file.subida,
+                        onCreate: function (location) { file.subida = location; },
+                        onProgress: function (bytes, total) {
+                            if (statusEl) {
+                                statusEl.textContent = "⏫ Subiendo " + file.name + ": " +
+                                    Math.floor(100 * bytes / Math.max(total, 1)) + "%";
+                            }
+                        }
+                    });
+                }).then(function (id) {
+                    var hidden = document.createElement("input");
+                    hidden.type = "hidden";
+                    hidden.name = "uploads";
+                    hidden.value = id;
+                    form.appendChild(hidden);
+                });
+            });
+            chain = chain.then(function () { input.files = small.files; });
+        });
+        return chain;
+    }
+
+    // Envía el formulario después de subir sus archivos grandes
+    function attach(form, statusEl) {
+        if (typeof DataTransfer === "undefined") {
+            return;
+        }
+        var busy = false;
+        form.addEventListener("submit", function (event) {
+            event.preventDefault();
+            if (busy) {
+                return;
+            }
+            busy = true;
+            prepareForm(form, statusEl).then(function () {
+                form.submit();
+            }, function (error) {
+                busy = false;
+                if (statusEl) {
+                    statusEl.textContent = "❌ No se pudo subir el archivo (" + error.message +
+                        "). Vuelva a intentar.";
+                }
+            });
+        });
+    }
+
+    scope.SubidaReanudable = {
+        THRESHOLD: THRESHOLD,
+        upload: upload,
+        prepareForm: prepareForm,
+        attach: attach
+    };
+})(self);
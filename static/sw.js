@@ -0,0 +1,68 @@
+// Service worker del modo técnico: guarda las páginas para abrirlas sin
+// señal y envía la cola de reportes (offline.js) cuando vuelve la conexión.
+importScripts("/static/resumable.js", "/static/offline.js");
+
+var CACHE = TecnicoOffline.CACHE;
+var SHELL = ["/tecnico", "/static/resumable.js", "/static/offline.js"];
+
+// Páginas que se pueden abrir sin conexión
+function isTechnicianPage(path) {
+    return path === "/tecnico" || /^\/m\/[^/]+\/nuevo$/.test(path) || path.indexOf("/static/") === 0;
+}
+
+self.addEventListener("install", function (event) {
+    event.waitUntil(
+        caches.open(CACHE).then(function (cache) {
+            return cache.addAll(SHELL);
+        }).then(function () {
+            return self.skipWaiting();
+        })
+    );
+});
+
+self.addEventListener("activate", function (event) {
+    event.waitUntil(
+        caches.keys().then(function (names) {
+            return Promise.all(names.filter(function (name) {
+                return name !== CACHE;
+            }).map(function (name) {
+                return caches.delete(name);
+            }));
+        }).then(function () {
+            return self.clients.claim();
+        })
+    );
+});
+
+// Primero la red (para ver técnicos y subpartes al día) y, sin señal, la copia guardada
+self.addEventListener("fetch", function (event) {
+    var request = event.request;
+    var url = new URL(request.url);
+    if (request.method !== "GET" || url.origin !== self.location.origin || !isTechnicianPage(url.pathname)) {
+        return;
+    }
+    event.respondWith(
+        fetch(request).then(function (response) {
+            if (response.ok) {
+                var copy = response.clone();
+                caches.open(CACHE).then(function (cache) {
+                    cache.put(request, copy);
+                });
+            }
+            return response;
+        }).catch(function () {
+            return caches.match(request, { ignoreSearch: true }).then(function (cached) {
+                return cached || new Response("Sin conexión y sin copia guardada de esta página.", {
+                    status: 503,
+                    headers: { "Content-Type": "text/plain; charset=utf-8" }
+                });
+            });
+        })
+    );
+});
+
+self.addEventListener("sync", function (event) {
+    if (event.tag === "reportes") {
+        event.waitUntil(TecnicoOffline.sync());
+    }
+});
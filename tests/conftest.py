@@ -0,0 +1,121 @@
+"""
+Fixtures comunes. app.py lee su configuración de variables de entorno al
+importarse y guarda uploads/ relativo al directorio actual, así que antes
+de importarlo se fija una carpeta temporal con la base y los archivos.
+"""
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKDIR = tempfile.mkdtemp(prefix="mantenimiento-tests-")
+
+os.environ.update(
+    DATABASE=os.path.join(WORKDIR, "db.sqlite3"),
+    DATABASE_URL="",
+    THUMBNAIL_WORKERS="0",
+    QR_CACHE_FOLDER=os.path.join(WORKDIR, "qr_cache"),
+    JINJA_CACHE_DIR=os.path.join(WORKDIR, "jinja"),
+    WRITER_SOCKET="",
+    METRICS_DIR="",
+    METRICS_TOKEN="",
+    PROFILE_MODE="",
+)
+for name in ("SMTP_HOST", "NOTIFY_EMAIL_TO", "NOTIFY_WEBHOOKS"):
+    os.environ.pop(name, None)
+os.chdir(WORKDIR)
+sys.path.insert(0, ROOT)
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def app():
+    app_module.init_db()
+    app_module.seed_data()
+    return app_module
+
+
+@pytest.fixture
+def client(app):
+    return app.app.test_client()
+
+
+@pytest.fixture
+def admin_client(client):
+    with client.session_transaction() as session:
+        session["is_admin"] = True
+    return client
+
+
+@pytest.fixture
+def add_work_orders(app):
+    """
+    Inserta órdenes directamente en la base (sin pasar por el escritor):
+    add_work_orders("VOLCADOR", 10, attachments=2) devuelve sus ids.
+    """
+
+    def add(section_code, count, attachments=0, **fields):
+        conn = app.connect_db()
+        try:
+            section = app.get_section(conn, section_code)
+            now = app.datetime.now().isoformat(timespec="minutes")
+            cur = conn.cursor()
+            ids = []
+            for i in range(count):
+                work_order = {
+                    "section_id": section["id"],
+                    "technician_id": None,
+                    "date": now,
+                    "type": "Aviso de desperfecto",
+                    "component": None,
+                    "failure_type": "Falla mecánica",
+                    "description": f"orden de prueba {i}",
+                    "downtime_min": 0,
+                    "machine_stopped": 0,
+                    "created_at": now,
+                    "resolved": 0,
+                    **fields,
+                }
+                work_order_id = app.create_work_order(cur, work_order)
+                stored = [
+                    {
+                        "filename": f"foto{j}.jpg",
+                        "mime_type": "image/jpeg",
+                        "path": f"00/00/{work_order_id:032x}{j:032x}.jpg",
+                        "sha256": f"{work_order_id:032x}{j:032x}",
+                        "size": 1,
+                    }
+                    for j in range(attachments)
+                ]
+                app.insert_attachments(cur, work_order_id, stored, now)
+                ids.append(work_order_id)
+            conn.commit()
+            return ids
+        finally:
+            conn.close()
+
+    return add
+
+
+def _reset_process_state(app):
+    """Olvida conexiones, escritor y cachés que apuntan a la base anterior."""
+    app._db_pool.clear()
+    app._writer_queue = None
+    app._reference_cache.update(version=None, checked_at=0.0, data={})
+    app._reliability_cache.update(key=None, data=None)
+
+
+@pytest.fixture
+def fresh_db(app, monkeypatch, tmp_path):
+    """Base vacía (con su archivo) solo para este test."""
+    monkeypatch.setattr(app, "DATABASE", str(tmp_path / "db.sqlite3"))
+    monkeypatch.setattr(app, "ARCHIVE_DATABASE", str(tmp_path / "archivo.sqlite3"))
+    _reset_process_state(app)
+    app.init_db()
+    app.seed_data()
+    yield app
+    _reset_process_state(app)
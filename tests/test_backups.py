@@ -0,0 +1,149 @@
+"""backups.py: copia en caliente, adjuntos incrementales y rotación."""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import backups
+
+
+class _Clock(datetime):
+    """datetime con now() fijo: cada copia necesita un nombre (segundo) distinto."""
+
+    current = datetime(2024, 3, 1, 12, 0, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    monkeypatch.setattr(backups, "datetime", _Clock)
+    return _Clock
+
+
+def _write(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _backup(app, uploads, backup_dir, keep_last=10, keep_weekly=0):
+    return backups.run_backup(
+        {"db.sqlite3": app.DATABASE},
+        str(uploads),
+        str(backup_dir),
+        keep_last,
+        keep_weekly,
+        pages=1,
+        pause=0.001,
+        busy_timeout_ms=1000,
+    )
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM work_orders;").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_backup_is_consistent_while_writing(fresh_db, add_work_orders, tmp_path, clock):
+    app = fresh_db
+    add_work_orders("VOLCADOR", 200, attachments=1)
+    stop = threading.Event()
+    commits = []
+
+    def write():
+        conn = sqlite3.connect(app.DATABASE, timeout=5)
+        try:
+            while not stop.is_set():
+                conn.execute(
+                    "INSERT INTO work_orders (section_id, date, type, description,"
+                    " created_at, resolved) VALUES (1, '2024-03-01T12:00',"
+                    " 'Aviso de desperfecto', 'durante la copia',"
+                    " '2024-03-01T12:00', 0);"
+                )
+                conn.commit()
+                commits.append(1)
+        finally:
+            conn.close()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        while len(commits) < 5:  # la copia arranca con escrituras en curso
+            stop.wait(0.01)
+        during = len(commits)
+        manifest = _backup(app, tmp_path / "uploads", tmp_path / "copias")
+        after = len(commits)
+    finally:
+        stop.set()
+        writer.join()
+
+    assert after > during  # el escritor no quedó bloqueado por la copia
+    copy = tmp_path / "copias" / manifest["name"] / "db.sqlite3"
+    assert backups.integrity_problems(copy) == []
+    assert manifest["databases"]["db.sqlite3"]["integrity"] == "ok"
+    assert 200 + during <= _count(copy) <= 200 + after + 1
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path / "copias"))
+
+
+def test_second_backup_copies_only_new_uploads(fresh_db, tmp_path, clock):
+    app = fresh_db
+    uploads = tmp_path / "uploads"
+    _write(uploads / "ab" / "cd" / "uno.jpg", b"1" * 10)
+    _write(uploads / "ab" / "ef" / "dos.pdf", b"2" * 20)
+    _write(uploads / "previews" / "ab" / "uno.webp")  # se regeneran: no se copian
+    _write(uploads / ".partes" / "subida")
+
+    first = _backup(app, uploads, tmp_path / "copias")
+    assert [f["path"] for f in first["uploads"]["new_files"]] == [
+        "ab/cd/uno.jpg",
+        "ab/ef/dos.pdf",
+    ]
+    assert first["uploads"]["new_bytes"] == 30
+
+    _write(uploads / "12" / "34" / "tres.png", b"3" * 5)
+    clock.current += timedelta(hours=1)
+    second = _backup(app, uploads, tmp_path / "copias")
+    assert second["uploads"] == {
+        "new_files": [{"path": "12/34/tres.png", "size": 5}],
+        "new_bytes": 5,
+    }
+    with open(tmp_path / "copias" / second["name"] / backups.MANIFEST) as f:
+        assert json.load(f)["uploads"] == second["uploads"]
+
+    mirror = tmp_path / "copias" / backups.UPLOADS_MIRROR
+    copied = sorted(
+        os.path.relpath(os.path.join(root, name), mirror).replace(os.sep, "/")
+        for root, _, files in os.walk(mirror)
+        for name in files
+    )
+    assert copied == ["12/34/tres.png", "ab/cd/uno.jpg", "ab/ef/dos.pdf"]
+    assert backups.list_snapshots(tmp_path / "copias") == [
+        first["name"],
+        second["name"],
+    ]
+
+
+def test_rotate_keeps_last_and_weekly(tmp_path):
+    # Una copia por día del lunes 1 al domingo 21 de enero (semanas ISO 1 a 3)
+    for day in range(1, 22):
+        name = datetime(2024, 1, day, 3).strftime(backups.SNAPSHOT_FORMAT)
+        _write(tmp_path / name / backups.MANIFEST, b"{}")
+    _write(tmp_path / "20240122-030000.tmp" / "db.sqlite3")  # copia interrumpida
+
+    removed = backups.rotate(str(tmp_path), keep_last=3, keep_weekly=2)
+
+    kept = ["20240114-030000", "20240119-030000", "20240120-030000", "20240121-030000"]
+    assert backups.list_snapshots(tmp_path) == kept
+    assert len(removed) == 21 - len(kept)
+    assert "20240107-030000" in removed  # semana 1: más vieja que keep_weekly
+    assert sorted(os.listdir(tmp_path)) == kept
@@ -0,0 +1,101 @@
+"""db.py: el SQL de sqlite3 también corre en PostgreSQL."""
+
+import os
+import uuid
+
+import pytest
+
+import db
+
+# PostgreSQL para las pruebas de integración (se saltan si no está definida)
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("SELECT * FROM t WHERE id = ?;", "SELECT * FROM t WHERE id = %s;"),
+        (
+            "INSERT INTO t (a, b) VALUES (:a, :b_2);",
+            "INSERT INTO t (a, b) VALUES (%(a)s, %(b_2)s);",
+        ),
+        # Los "%" del SQL se escapan y "::tipo" no es un parámetro
+        (
+            "SELECT x::text FROM t WHERE y LIKE '%a' AND z = ?",
+            "SELECT x::text FROM t WHERE y LIKE '%%a' AND z = %s",
+        ),
+        ("BEGIN IMMEDIATE;", "BEGIN"),
+        ("  begin immediate", "BEGIN"),
+    ],
+)
+def test_translate(sql, expected):
+    assert db.translate(sql) == expected
+
+
+def test_translate_without_params_keeps_percent():
+    assert db.translate("SELECT '100%';", with_params=False) == "SELECT '100%';"
+
+
+def test_backend():
+    assert db.backend("") == db.SQLITE
+    assert db.backend("postgresql://u@h/base") == db.POSTGRES
+    assert db.backend("postgres://u@h/base") == db.POSTGRES
+    with pytest.raises(ValueError):
+        db.backend("mysql://u@h/base")
+
+
+def test_row_reads_by_name_and_position():
+    row = db.Row({"id": 0, "name": 1}, (7, "Volcador"))
+    assert row["name"] == row[1] == "Volcador"
+    assert list(row) == [7, "Volcador"]
+    assert row.keys() == ["id", "name"]
+    assert dict(zip(row.keys(), row)) == {"id": 7, "name": "Volcador"}
+
+
+@pytest.fixture
+def pg():
+    if not TEST_DATABASE_URL:
+        pytest.skip("defina TEST_DATABASE_URL para probar con PostgreSQL")
+    pytest.importorskip("psycopg")
+    conn = db.connect_postgres(TEST_DATABASE_URL)
+    table = f"prueba_{uuid.uuid4().hex[:8]}"
+    conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, name TEXT);")
+    yield conn, table
+    conn.rollback()
+    conn.execute(f"DROP TABLE {table};")
+    conn.close()
+
+
+def test_postgres_runs_sqlite_style_sql(pg):
+    conn, table = pg
+    conn.execute(f"INSERT INTO {table} (id, name) VALUES (?, ?);", (1, "uno"))
+    # Como sqlite3: la escritura abrió una transacción que espera el commit
+    assert conn.in_transaction
+    conn.commit()
+    assert not conn.in_transaction
+
+    conn.cursor().executemany(
+        f"INSERT INTO {table} (id, name) VALUES (:id, :name);",
+        [{"id": i, "name": f"n{i}"} for i in range(2, 12)],
+    )
+    conn.rollback()
+    assert conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0] == 1
+
+    row = conn.execute(f"SELECT * FROM {table} WHERE id = ?;", (1,)).fetchone()
+    assert row["name"] == row[1] == "uno"
+    assert db.table_exists(conn, table)
+
+
+def test_postgres_iter_batches(pg):
+    conn, table = pg
+    db.insert_rows(
+        conn.cursor(), table, ["id", "name"], [(i, f"n{i}") for i in range(25)]
+    )
+    conn.commit()
+
+    batches = list(
+        db.iter_batches(conn, f"SELECT id FROM {table} ORDER BY id;", (), 10)
+    )
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert [r[0] for b in batches for r in b] == list(range(25))
+    assert not conn.in_transaction
@@ -0,0 +1,75 @@
+"""Exportación por lotes: orden estable y órdenes archivadas incluidas."""
+
+import sqlite3
+
+import pytest
+
+
+@pytest.fixture
+def archived_history(fresh_db, add_work_orders):
+    """Órdenes viejas resueltas (se archivan) y órdenes recientes, en dos secciones."""
+    old = {"date": "2020-01-05T08:00", "resolved": 1, "resolution_at": None}
+    ids = add_work_orders("VOLCADOR", 5, **old)
+    ids += add_work_orders("ELEVADOR", 3, **old)
+    ids += add_work_orders("VOLCADOR", 4)
+    ids += add_work_orders("ELEVADOR", 2, date="2019-12-31T23:00")  # abiertas
+
+    conn = fresh_db.connect_db()
+    try:
+        assert fresh_db.archive_work_orders(conn, "2021-01-01") == 8
+    finally:
+        conn.close()
+    return ids
+
+
+def test_export_merges_archive_in_id_order(fresh_db, archived_history):
+    rows = list(fresh_db.iter_export_rows())
+    assert [r["id"] for r in rows] == sorted(archived_history)
+
+
+def test_export_by_section_is_in_date_order(fresh_db, archived_history):
+    conn = fresh_db.connect_db()
+    section_id = fresh_db.get_section(conn, "VOLCADOR")["id"]
+    conn.close()
+    rows = list(fresh_db.iter_export_rows(section_id=section_id))
+
+    assert len(rows) == 9
+    assert {r["section_code"] for r in rows} == {"VOLCADOR"}
+    assert [(r["date"], r["id"]) for r in rows] == sorted(
+        (r["date"], r["id"]) for r in rows
+    )
+
+
+def test_export_batches_keep_attachments(fresh_db, add_work_orders, monkeypatch):
+    monkeypatch.setattr(fresh_db, "EXPORT_BATCH_SIZE", 2)
+    ids = add_work_orders("VOLCADOR", 5, attachments=2)
+
+    rows = list(fresh_db.iter_export_rows())
+    assert [r["id"] for r in rows] == ids
+    assert all(len(r["attachments"]) == 2 for r in rows)
+
+
+@pytest.mark.parametrize("by_section", [False, True])
+def test_export_does_not_sort_in_memory(
+    fresh_db, archived_history, monkeypatch, by_section
+):
+    """El ORDER BY sigue un índice: SQLite no arma un B-tree temporal con todo."""
+    statements = []
+    connect = fresh_db.connect_db
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(fresh_db, "connect_db", traced_connect)
+    list(fresh_db.iter_export_rows(section_id=1 if by_section else None))
+
+    exports = [s for s in statements if "ORDER BY w." in s]
+    assert len(exports) == 2  # base principal y archivo
+    conn = sqlite3.connect(fresh_db.DATABASE)
+    conn.execute("ATTACH DATABASE ? AS archive;", (fresh_db.ARCHIVE_DATABASE,))
+    for sql in exports:
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        assert not any("TEMP B-TREE" in step for step in plan), plan
+    conn.close()
@@ -0,0 +1,87 @@
+"""Importación histórica desde CSV y migración de adjuntos antiguos."""
+
+import os
+
+
+def _import(app, rows, create_technicians=True):
+    rejected = []
+    conn = app.connect_db()
+    try:
+        result = app.import_work_orders(
+            conn,
+            rows,
+            lambda line, raw, error: rejected.append((line, error)),
+            create_technicians=create_technicians,
+        )
+        names = {r["name"] for r in conn.execute("SELECT name FROM technicians;")}
+    finally:
+        conn.close()
+    return result, rejected, names
+
+
+def test_rejected_rows_do_not_create_technicians(fresh_db):
+    row = {
+        "section_code": "VOLCADOR",
+        "date": "2023-03-01 10:00",
+        "description": "cambio de rodamiento",
+    }
+    rows = [
+        dict(row, technician_name="Técnico Válido"),
+        dict(row, technician_name="Fecha Mala", date="31/02/2023"),
+        dict(row, technician_name="Sección Mala", section_code="NO_EXISTE"),
+        dict(row, technician_name="Parada Mala", machine_stopped="quizás"),
+    ]
+
+    (imported, rejected), errors, names = _import(fresh_db, rows)
+
+    assert (imported, rejected) == (1, 3)
+    assert [line for line, _ in errors] == [3, 4, 5]
+    assert "Técnico Válido" in names
+    assert not names & {"Fecha Mala", "Sección Mala", "Parada Mala"}
+
+
+def test_unknown_technician_is_rejected_without_create(fresh_db):
+    rows = [
+        {
+            "section_code": "VOLCADOR",
+            "date": "2023-03-01",
+            "description": "x",
+            "technician_name": "Nadie",
+        }
+    ]
+    (imported, rejected), errors, names = _import(
+        fresh_db, rows, create_technicians=False
+    )
+    assert (imported, rejected) == (0, 1)
+    assert "técnico desconocido" in errors[0][1]
+    assert "Nadie" not in names
+
+
+def test_migrate_uploads_with_shared_legacy_file(fresh_db, add_work_orders):
+    legacy = os.path.join(fresh_db.app.config["UPLOAD_FOLDER"], "bomba.jpg")
+    os.makedirs(os.path.dirname(legacy), exist_ok=True)
+    with open(legacy, "wb") as fh:
+        fh.write(b"foto antigua de la bomba")
+
+    work_order_ids = add_work_orders("VOLCADOR", 2)
+    conn = fresh_db.connect_db()
+    for work_order_id in work_order_ids:
+        # Dos filas antiguas con el mismo archivo (por ruta y por nombre)
+        conn.execute(
+            """
+            INSERT INTO attachments (work_order_id, filename, mime_type, path, created_at)
+            VALUES (?, 'bomba.jpg', 'image/jpeg', ?, '2020-01-01T00:00');
+        """,
+            (work_order_id, legacy if work_order_id % 2 else "no/existe.jpg"),
+        )
+    conn.commit()
+
+    result = fresh_db.app.test_cli_runner().invoke(args=["migrate-uploads"])
+
+    assert result.exception is None, result.output
+    assert "2 adjuntos movidos" in result.output
+    rows = conn.execute("SELECT sha256, path FROM attachments;").fetchall()
+    conn.close()
+    assert len({tuple(r) for r in rows}) == 1
+    assert os.path.exists(rows[0]["path"])
+    assert not os.path.exists(legacy)
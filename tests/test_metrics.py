@@ -0,0 +1,42 @@
+"""/metrics: latencia y SQL por ruta en el formato de Prometheus."""
+
+
+def _scrape(client, **kwargs):
+    response = client.get("/metrics", **kwargs)
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    values = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            values[name] = float(value)
+    return values
+
+
+def test_scrape_counts_a_request(client):
+    before = _scrape(client)
+    assert client.get("/m/VOLCADOR").status_code == 200
+    after = _scrape(client)
+
+    def delta(name):
+        return after.get(name, 0) - before.get(name, 0)
+
+    assert (
+        delta('http_requests_total{endpoint="section_view",method="GET",status="200"}')
+        == 1
+    )
+    assert delta('http_request_duration_seconds_count{endpoint="section_view"}') == 1
+    assert delta('sql_statements_per_request_count{endpoint="section_view"}') == 1
+    assert delta('sql_statements_per_request_sum{endpoint="section_view"}') > 0
+    # El histograma acumula: +Inf cuenta todos los requests
+    assert (
+        after['http_request_duration_seconds_bucket{endpoint="section_view",le="+Inf"}']
+        == after['http_request_duration_seconds_count{endpoint="section_view"}']
+    )
+
+
+def test_scrape_requires_token_when_configured(app, client, monkeypatch):
+    monkeypatch.setattr(app, "METRICS_TOKEN", "secreto")
+    assert client.get("/metrics").status_code == 401
+    _scrape(client, query_string={"key": "secreto"})
+    _scrape(client, headers={"Authorization": "Bearer secreto"})
@@ -0,0 +1,278 @@
+"""Avisos por webhook y correo: outbox y despachador contra servidores locales."""
+
+import json
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+from email import message_from_bytes
+from email.policy import default
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import notifications
+
+
+class _WebhookHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        server = self.server
+        if server.fail > 0:
+            server.fail -= 1
+            self.send_response(503)
+        else:
+            server.received.append(json.loads(body))
+            self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    """Endpoint HTTP local; webhook.fail = N responde 503 a los N siguientes POST."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WebhookHandler)
+    server.received = []
+    server.fail = 0
+    server.url = f"http://127.0.0.1:{server.server_port}/hook"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Lo justo de SMTP para smtplib: guarda cada mensaje recibido."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.reply("220 localhost")
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                self.reply("354 fin con <CRLF>.<CRLF>")
+                data = b""
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    data += line[1:] if line.startswith(b"..") else line
+                self.server.received.append(message_from_bytes(data, policy=default))
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 chau")
+                break
+            else:  # EHLO, MAIL, RCPT, RSET, NOOP
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def channels(fresh_db, smtp_server, webhook, monkeypatch):
+    """Correo y un webhook apuntando a los servidores locales."""
+    app = fresh_db
+    monkeypatch.setattr(app, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(app, "SMTP_PORT", smtp_server.server_address[1])
+    monkeypatch.setattr(app, "SMTP_USER", "")
+    monkeypatch.setattr(app, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(app, "NOTIFY_EMAIL_TO", ["jefe@planta.local"])
+    monkeypatch.setattr(app, "NOTIFY_WEBHOOKS", [webhook.url])
+    monkeypatch.setattr(
+        app,
+        "NOTIFY_CHANNELS",
+        {
+            notifications.EMAIL: None,
+            notifications.webhook_channel(webhook.url): webhook.url,
+        },
+    )
+    return app
+
+
+def _make_due(conn):
+    """Vence la espera para juntar avisos (NOTIFY_COALESCE_SECONDS)."""
+    conn.execute("UPDATE outbox SET next_attempt_at = '2000-01-01T00:00:00';")
+    conn.commit()
+
+
+def test_report_names_the_technician(fresh_db, client, webhook, monkeypatch):
+    app = fresh_db
+    monkeypatch.setattr(
+        app,
+        "NOTIFY_CHANNELS",
+        {notifications.webhook_channel(webhook.url): webhook.url},
+    )
+    conn = app.connect_db()
+    technician = conn.execute(
+        "SELECT id, name FROM technicians ORDER BY id LIMIT 1;"
+    ).fetchone()
+
+    response = client.post(
+        "/m/VOLCADOR/nuevo",
+        data={
+            "technician_id": str(technician["id"]),
+            "type": "Aviso de desperfecto",
+            "description": "ruido en el reductor",
+        },
+    )
+    assert response.status_code == 302
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (1, 0)
+    conn.close()
+    [message] = webhook.received
+    assert message["work_orders"][0]["technician_id"] == technician["id"]
+    assert f"Reportado por: {technician['name']}" in message["text"]
+
+
+def _outbox(conn):
+    return conn.execute(
+        "SELECT status, attempts, next_attempt_at, delivered, last_error"
+        " FROM outbox ORDER BY id;"
+    ).fetchall()
+
+
+def test_reports_of_a_section_go_in_one_message(
+    channels, add_work_orders, smtp_server, webhook
+):
+    app = channels
+    add_work_orders("VOLCADOR", 3, type="Aviso de desperfecto")
+    add_work_orders("ELEVADOR", 1, type="Aviso de desperfecto")
+    add_work_orders("ELEVADOR", 1, type="Mantenimiento preventivo")  # no avisa
+    conn = app.connect_db()
+
+    # Recién creados esperan NOTIFY_COALESCE_SECONDS por otros de su sección
+    assert app.dispatch_notifications(conn) == (0, 0)
+    assert smtp_server.received == webhook.received == []
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (4, 0)
+    assert app.dispatch_notifications(conn) == (0, 0)  # no se repiten
+    conn.close()
+
+    subjects = sorted(m["Subject"] for m in smtp_server.received)
+    assert len(subjects) == 2
+    assert "3 avisos de desperfecto" in subjects[0]
+    assert subjects[1].startswith("⚠ Aviso de desperfecto en")
+    assert all(m["To"] == "jefe@planta.local" for m in smtp_server.received)
+    by_section = {m["section"]["code"]: m for m in webhook.received}
+    assert sorted(by_section) == ["ELEVADOR", "VOLCADOR"]
+    assert len(by_section["VOLCADOR"]["work_orders"]) == 3
+    assert len(by_section["ELEVADOR"]["work_orders"]) == 1
+
+
+def test_failed_channel_is_retried_with_backoff(
+    channels, add_work_orders, smtp_server, webhook, monkeypatch
+):
+    app = channels
+    monkeypatch.setattr(app, "NOTIFY_MAX_ATTEMPTS", 3)
+    add_work_orders("VOLCADOR", 2, type="Aviso de desperfecto")
+    conn = app.connect_db()
+    webhook.fail = 2
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (0, 2)
+    rows = _outbox(conn)
+    assert [r["status"] for r in rows] == ["pending", "pending"]
+    assert [r["attempts"] for r in rows] == [1, 1]
+    assert all(json.loads(r["delivered"]) == ["email"] for r in rows)
+    assert all("HTTP 503" in r["last_error"] for r in rows)
+    first_wait = rows[0]["next_attempt_at"]
+    assert first_wait > app.datetime.now().isoformat(timespec="seconds")
+    # Antes de la espera no se reintenta
+    assert app.dispatch_notifications(conn) == (0, 0)
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (0, 2)
+    assert [r["attempts"] for r in _outbox(conn)] == [2, 2]
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (2, 0)
+    rows = _outbox(conn)
+    conn.close()
+    assert [r["status"] for r in rows] == ["sent", "sent"]
+    # El correo salió una sola vez; solo el webhook se reintentó
+    assert len(smtp_server.received) == 1
+    assert len(webhook.received) == 1
+
+
+def test_report_fails_after_max_attempts(
+    channels, add_work_orders, webhook, monkeypatch
+):
+    app = channels
+    monkeypatch.setattr(app, "NOTIFY_MAX_ATTEMPTS", 2)
+    add_work_orders("VOLCADOR", 1, type="Aviso de desperfecto")
+    conn = app.connect_db()
+    webhook.fail = 10
+
+    for _ in range(2):
+        _make_due(conn)
+        assert app.dispatch_notifications(conn) == (0, 1)
+    [row] = _outbox(conn)
+    assert (row["status"], row["attempts"]) == ("failed", 2)
+
+    # Los fallidos ya no se intentan
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (0, 0)
+    conn.close()
+    assert webhook.received == []
+
+
+@pytest.mark.parametrize(
+    "url", ["hooks.example.com/x", "ftp://h/x", "http:///x", "http://h:abc/x"]
+)
+def test_bad_webhook_url_is_rejected(url):
+    with pytest.raises(ValueError):
+        notifications.check_webhook_url(url)
+
+
+def test_bad_webhook_url_stops_startup(app):
+    result = subprocess.run(
+        [sys.executable, "-c", "import app"],
+        env={
+            **os.environ,
+            "NOTIFY_WEBHOOKS": "https://ok.example/x, hooks.example.com/x",
+            "PYTHONPATH": os.path.dirname(app.__file__),
+        },
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "NOTIFY_WEBHOOKS: URL inválida 'hooks.example.com/x'" in result.stderr
+
+
+def test_unusable_webhook_is_retried_not_fatal(
+    channels, add_work_orders, smtp_server, monkeypatch
+):
+    app = channels
+    bad = "hooks.example.com/x"  # sin validar, como si llegara de otro lado
+    monkeypatch.setattr(
+        app,
+        "NOTIFY_CHANNELS",
+        {notifications.EMAIL: None, notifications.webhook_channel(bad): bad},
+    )
+    add_work_orders("VOLCADOR", 1, type="Aviso de desperfecto")
+    conn = app.connect_db()
+
+    _make_due(conn)
+    assert app.dispatch_notifications(conn) == (0, 1)
+    [row] = _outbox(conn)
+    conn.close()
+    assert (row["status"], row["attempts"]) == ("pending", 1)
+    assert json.loads(row["delivered"]) == ["email"]
+    assert "unknown url type" in row["last_error"]
+    assert len(smtp_server.received) == 1
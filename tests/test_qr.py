@@ -0,0 +1,95 @@
+"""/admin/qr: ZIP y PDF de etiquetas, con caché que solo redibuja lo que cambió."""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+
+@pytest.fixture
+def qr_cache(fresh_db, monkeypatch, tmp_path):
+    """Caché de etiquetas vacía y pool de procesos propio del test."""
+    app = fresh_db
+    folder = tmp_path / "qr"
+    monkeypatch.setattr(app, "QR_CACHE_FOLDER", str(folder))
+    monkeypatch.setattr(app, "QR_WORKERS", 2)
+    monkeypatch.setattr(app, "REFERENCE_CACHE_CHECK_SECONDS", 0)
+    yield folder
+    if app._qr_pool is not None:
+        app._qr_pool.shutdown()
+        app._qr_pool = None
+
+
+def _labels(folder):
+    """{archivo: (mtime_ns, bytes)} de la caché."""
+    labels = {}
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        with open(path, "rb") as f:
+            labels[name] = (os.stat(path).st_mtime_ns, f.read())
+    return labels
+
+
+def _zip_entries(response):
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+def test_rename_redraws_only_that_label(fresh_db, admin_client, qr_cache):
+    app = fresh_db
+    conn = app.connect_db()
+    sections = conn.execute("SELECT id, code FROM sections ORDER BY code;").fetchall()
+    conn.close()
+    url = "/admin/qr?base_url=https://planta.example&size=200"
+
+    first = _zip_entries(admin_client.get(url))
+    assert sorted(first) == sorted(f"qr_{s['code']}.png" for s in sections)
+    assert all(data.startswith(b"\x89PNG") for data in first.values())
+    before = _labels(qr_cache)
+    assert len(before) == len(sections)
+
+    # Sin cambios: todo sale de la caché
+    assert _zip_entries(admin_client.get(url)) == first
+    assert _labels(qr_cache) == before
+
+    renamed = sections[0]
+    response = admin_client.post(
+        f"/admin/sections/{renamed['id']}/edit",
+        data={"name": "Volcador nuevo", "description": ""},
+    )
+    assert response.status_code == 302
+
+    second = _zip_entries(admin_client.get(url))
+    after = _labels(qr_cache)
+    new_files = set(after) - set(before)
+    assert len(new_files) == 1
+    assert next(iter(new_files)).startswith(f"{renamed['code']}-")
+    # Las demás etiquetas no se volvieron a dibujar
+    assert {name: after[name] for name in before} == before
+    changed = {name for name in first if first[name] != second[name]}
+    assert changed == {f"qr_{renamed['code']}.png"}
+
+
+def test_pdf_sheet(admin_client, qr_cache):
+    response = admin_client.get("/admin/qr?format=pdf&size=150&section=VOLCADOR")
+    assert response.status_code == 200
+    assert response.mimetype == "application/pdf"
+    assert response.get_data().startswith(b"%PDF")
+    assert len(os.listdir(qr_cache)) == 1
+
+
+@pytest.mark.parametrize(
+    "query, status",
+    [
+        ("format=svg", 400),
+        ("base_url=planta.example", 400),
+        ("size=grande", 400),
+        ("section=NO_EXISTE", 404),
+    ],
+)
+def test_bad_requests(admin_client, qr_cache, query, status):
+    assert admin_client.get(f"/admin/qr?{query}").status_code == status
@@ -0,0 +1,65 @@
+"""Cada página cuesta las mismas sentencias SQL con más o menos órdenes y adjuntos."""
+
+import pytest
+
+
+@pytest.fixture
+def count_statements(app, monkeypatch):
+    """
+    Las conexiones nuevas anotan cada sentencia (set_trace_callback).
+    count_statements(client.get, url) devuelve cuántas ejecutó el request.
+    """
+    statements = []
+    connect = app.connect_db
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(app, "connect_db", traced_connect)
+    # La versión de referencia se consulta siempre (no según el reloj)
+    monkeypatch.setattr(app, "REFERENCE_CACHE_CHECK_SECONDS", 0)
+    app._db_pool.clear()
+
+    def count(method, url):
+        method(url)  # calienta cachés y el pool de conexiones
+        statements.clear()
+        response = method(url)
+        assert response.status_code == 200, response.status_code
+        return len(statements)
+
+    yield count
+    app._db_pool.clear()
+
+
+PAGES = [
+    "/m/VOLCADOR",
+    "/m/VOLCADOR/historial.json",
+    "/admin/issues",
+    "/admin/indicadores",
+]
+
+
+@pytest.mark.parametrize("url", PAGES)
+def test_page_statements_do_not_grow_with_rows(
+    admin_client, add_work_orders, count_statements, url
+):
+    add_work_orders("VOLCADOR", 3, attachments=1)
+    small = count_statements(admin_client.get, url)
+
+    add_work_orders("VOLCADOR", 60, attachments=3)
+    large = count_statements(admin_client.get, url)
+
+    assert small == large
+
+
+def test_resolve_page_statements_do_not_grow_with_attachments(
+    admin_client, add_work_orders, count_statements
+):
+    few = add_work_orders("ELEVADOR", 1, attachments=1)[0]
+    many = add_work_orders("ELEVADOR", 1, attachments=20)[0]
+
+    assert count_statements(
+        admin_client.get, f"/admin/issues/{few}/resolver"
+    ) == count_statements(admin_client.get, f"/admin/issues/{many}/resolver")
@@ -0,0 +1,74 @@
+"""reliability.py: MTBF, percentiles, Weibull y fallas repetidas por subparte."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+import reliability
+
+START = datetime(2024, 1, 1)
+
+
+def _dates(hours):
+    """Fechas ISO (minutos) de avisos separados por esos intervalos."""
+    moments = START + np.cumsum([0.0, *hours]) * timedelta(hours=1)
+    return [m.isoformat(timespec="minutes") for m in moments]
+
+
+def test_known_intervals():
+    dates = _dates([10, 20, 30, 40])
+    result = reliability.component_reliability(
+        [1] * 5,
+        ["Motor"] * 5,
+        ["Eléctrica", "Eléctrica", "Mecánica", "Eléctrica", "Eléctrica"],
+        dates[::-1],  # el orden de llegada no importa
+        recurrence_days=1,
+    )
+    [row] = result
+    assert (row["section_id"], row["component"]) == (1, "Motor")
+    assert (row["failures"], row["intervals"]) == (5, 4)
+    assert row["mtbf_h"] == pytest.approx(25)
+    assert row["median_h"] == pytest.approx(25)
+    assert row["p10_h"] == pytest.approx(13)
+    assert row["p90_h"] == pytest.approx(37)
+    # Se repite el tipo en 10 h y 40 h; la de 40 h queda fuera de 1 día
+    assert row["repeat_rate"] == pytest.approx(0.25)
+    assert row["top_failure_type"] == "Eléctrica"
+    assert row["top_failure_share"] == pytest.approx(0.8)
+
+
+def test_weibull_fit_recovers_known_parameters():
+    rng = np.random.default_rng(2024)
+    params = {("Motor", 1): (0.8, 200.0), ("Cadena", 2): (2.5, 50.0)}
+    sections, components, dates = [], [], []
+    for (component, section_id), (beta, eta) in params.items():
+        hours = eta * rng.weibull(beta, 3000)
+        group_dates = _dates(hours)
+        sections += [section_id] * len(group_dates)
+        components += [component] * len(group_dates)
+        dates += group_dates
+
+    result = reliability.component_reliability(
+        sections, components, ["Falla"] * len(dates), dates
+    )
+
+    by_component = {row["component"]: row for row in result}
+    for (component, _), (beta, eta) in params.items():
+        row = by_component[component]
+        assert row["weibull_beta"] == pytest.approx(beta, rel=0.05)
+        assert row["weibull_eta_h"] == pytest.approx(eta, rel=0.05)
+
+
+def test_too_few_intervals_leave_fit_empty():
+    [row] = reliability.component_reliability(
+        [3, 3], ["Sensor", "Sensor"], ["", ""], _dates([5])
+    )
+    assert row["intervals"] == 1
+    assert row["mtbf_h"] == pytest.approx(5)
+    assert row["weibull_beta"] is None
+    assert row["weibull_eta_h"] is None
+
+
+def test_empty_input():
+    assert reliability.component_reliability([], [], [], []) == []
@@ -0,0 +1,57 @@
+"""/api/sync: reportes del modo sin conexión."""
+
+from datetime import datetime
+
+
+def _record(key, **fields):
+    return {
+        "key": key,
+        "section_code": "ACUMULACION",
+        "type": "Aviso de desperfecto",
+        "description": "correa cortada",
+        **fields,
+    }
+
+
+def test_sync_stores_aware_dates_as_local_time(app, admin_client):
+    recorded_at = "2024-05-10T08:30:00+03:00"
+    response = admin_client.post(
+        "/api/sync",
+        json={"records": [_record("tz-aware-0001", recorded_at=recorded_at)]},
+    )
+    [result] = response.get_json()["results"]
+    assert result["status"] == "created"
+
+    conn = app.connect_db()
+    stored = conn.execute(
+        "SELECT date FROM work_orders WHERE id = ?;", (result["id"],)
+    ).fetchone()[0]
+    conn.close()
+    expected = datetime.fromisoformat(recorded_at).astimezone().replace(tzinfo=None)
+    assert stored == expected.isoformat(timespec="minutes")
+
+    # Resolverlo calcula el tiempo de reparación con esa fecha
+    response = admin_client.post(
+        f"/admin/issues/{result['id']}/resolver",
+        data={"resolution_description": "correa nueva"},
+    )
+    assert response.status_code == 302
+
+
+def test_sync_rejects_bad_attachments_per_record(admin_client):
+    response = admin_client.post(
+        "/api/sync",
+        json={
+            "records": [
+                _record("bad-attachments-1", attachments=5),
+                _record("bad-attachments-2", attachments=["foto", 3]),
+                _record("good-attachments", attachments=[]),
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = {r["key"]: r for r in response.get_json()["results"]}
+    assert results["bad-attachments-1"]["status"] == "error"
+    assert "attachments" in results["bad-attachments-1"]["error"]
+    assert results["bad-attachments-2"]["status"] == "error"
+    assert results["good-attachments"]["status"] == "created"
@@ -0,0 +1,98 @@
+"""Subidas reanudables (/subidas): una parte cortada se retoma desde HEAD."""
+
+import base64
+import hashlib
+import io
+import os
+
+TUS = {"Tus-Resumable": "1.0.0"}
+PART = {**TUS, "Content-Type": "application/offset+octet-stream"}
+
+
+class _CutStream(io.BytesIO):
+    """Cuerpo de una parte cuya conexión se cierra después de `arrive` bytes."""
+
+    def __init__(self, data, arrive):
+        super().__init__(data)
+        self.arrive = arrive
+
+    def readinto(self, buffer):
+        left = self.arrive - self.tell()
+        if left <= 0:
+            return 0  # el socket se cerró antes del Content-Length
+        return super().readinto(memoryview(buffer)[:left])
+
+
+def _create(client, data, name="video.mp4"):
+    metadata = "filename " + base64.b64encode(name.encode()).decode()
+    response = client.post(
+        "/subidas",
+        headers={**TUS, "Upload-Length": str(len(data)), "Upload-Metadata": metadata},
+    )
+    assert response.status_code == 201
+    return response.headers["Location"]
+
+
+def _offset(client, location):
+    response = client.head(location, headers=TUS)
+    assert response.status_code == 200
+    return int(response.headers["Upload-Offset"])
+
+
+def test_resume_after_cut_part(app, client):
+    data = os.urandom(300_000)
+    location = _create(client, data)
+
+    # La conexión se corta después de 120 000 bytes de una parte de 200 000
+    response = client.patch(
+        location,
+        input_stream=_CutStream(data[:200_000], arrive=120_000),
+        headers={**PART, "Upload-Offset": "0"},
+    )
+    assert response.status_code == 400  # ClientDisconnected
+    assert _offset(client, location) == 120_000
+
+    # Una parte desde un offset viejo se rechaza con el correcto
+    response = client.patch(
+        location, data=data[:1000], headers={**PART, "Upload-Offset": "0"}
+    )
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == "120000"
+
+    response = client.patch(
+        location, data=data[120_000:], headers={**PART, "Upload-Offset": "120000"}
+    )
+    assert response.status_code == 204
+    assert response.headers["Upload-Offset"] == str(len(data))
+
+    # El archivo completo se adjunta a un reporte por su id
+    upload_id = location.rsplit("/", 1)[-1]
+    response = client.post(
+        "/m/SINGULACION/nuevo",
+        data={
+            "type": "Mantenimiento correctivo",
+            "description": "video del atasco",
+            "uploads": upload_id,
+        },
+    )
+    assert response.status_code == 302
+
+    conn = app.connect_db()
+    attachment = conn.execute(
+        "SELECT * FROM attachments ORDER BY id DESC LIMIT 1;"
+    ).fetchone()
+    conn.close()
+    assert attachment["filename"] == "video.mp4"
+    assert attachment["size"] == len(data)
+    assert attachment["sha256"] == hashlib.sha256(data).hexdigest()
+    with open(attachment["path"], "rb") as fh:
+        assert fh.read() == data
+
+
+def test_part_larger_than_upload_is_rejected(client):
+    location = _create(client, b"x" * 10)
+    response = client.patch(
+        location, data=b"x" * 11, headers={**PART, "Upload-Offset": "0"}
+    )
+    assert response.status_code == 413
+    assert _offset(client, location) == 0
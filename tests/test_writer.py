@@ -0,0 +1,108 @@
+"""Escrituras del escritor único (group commit)."""
+
+import pytest
+
+
+@pytest.fixture
+def cursor(fresh_db):
+    conn = fresh_db.connect_db()
+    yield conn.cursor()
+    conn.rollback()
+    conn.close()
+
+
+def _work_order(app, key):
+    now = app.datetime.now().isoformat(timespec="minutes")
+    return {
+        "section_id": 1,
+        "technician_id": None,
+        "date": now,
+        "type": "Aviso de desperfecto",
+        "component": None,
+        "failure_type": None,
+        "description": "reporte repetido",
+        "downtime_min": 0,
+        "machine_stopped": 0,
+        "created_at": now,
+        "resolved": 0,
+        "client_key": key,
+    }
+
+
+def _attachment(name):
+    return {
+        "filename": name,
+        "mime_type": "image/jpeg",
+        "path": f"00/00/{name}",
+        "sha256": name.ljust(64, "0"),
+        "size": 1,
+    }
+
+
+class _LateDuplicateCursor:
+    """
+    Cursor que no ve las claves ya guardadas al revisar: como si otro
+    worker las hubiera guardado justo después de esa consulta.
+    """
+
+    def __init__(self, cur):
+        self._cur = cur
+
+    def execute(self, sql, *args):
+        self._cur.execute(
+            sql.replace("WHERE client_key IN", "WHERE 0 AND client_key IN"), *args
+        )
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+
+def test_add_work_order_with_duplicate_key_returns_existing(fresh_db, cursor):
+    first, _ = fresh_db.add_work_order(
+        cursor, _work_order(fresh_db, "dup-key-0001"), [_attachment("a")]
+    )
+    again, pending = fresh_db.add_work_order(
+        cursor, _work_order(fresh_db, "dup-key-0001"), [_attachment("b")]
+    )
+    assert again == first
+    assert pending == []
+    assert cursor.execute("SELECT COUNT(*) FROM attachments;").fetchone()[0] == 1
+
+
+def test_sync_reports_late_duplicate(fresh_db, cursor):
+    fresh_db.sync_work_orders(cursor, [(_work_order(fresh_db, "dup-key-0002"), [])])
+
+    results, pending = fresh_db.sync_work_orders(
+        _LateDuplicateCursor(cursor),
+        [(_work_order(fresh_db, "dup-key-0002"), [_attachment("c")])],
+    )
+    [result] = results
+    assert result["status"] == "duplicate"
+    assert result["id"] is not None
+    assert pending == []
+
+
+def test_resolve_missing_issue_returns_none(fresh_db, cursor):
+    assert fresh_db.resolve_issue(cursor, 999999, "x", "2024-01-01T00:00", []) is None
+
+
+def test_resolve_issue_archived_after_opening_form(
+    fresh_db, add_work_orders, admin_client, monkeypatch
+):
+    [issue_id] = add_work_orders("VOLCADOR", 1)
+    submit_write = fresh_db.submit_write
+
+    def delete_then_submit(op, *args):
+        # Se archiva (sale de la base principal) mientras el admin completa el formulario
+        conn = fresh_db.connect_db()
+        conn.execute("DELETE FROM work_orders WHERE id = ?;", (issue_id,))
+        conn.commit()
+        conn.close()
+        return submit_write(op, *args)
+
+    monkeypatch.setattr(fresh_db, "submit_write", delete_then_submit)
+    response = admin_client.post(
+        f"/admin/issues/{issue_id}/resolver", data={"resolution_description": "ok"}
+    )
+    assert response.status_code == 404
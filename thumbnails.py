@@ -0,0 +1,105 @@
+"""
+Miniaturas de los adjuntos (fotos y videos).
+
+Este módulo no importa app.py: lo cargan los procesos del pool de
+miniaturas, que deben arrancar rápido y sin tocar la base de datos.
+"""
+
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image, ImageOps, features
+
+# Tamaño máximo de la miniatura (se mantiene la proporción)
+THUMBNAIL_SIZE = (320, 320)
+
+# Segundos máximos para sacar el fotograma de un video con ffmpeg
+POSTER_TIMEOUT = 60
+
+
+def preview_paths(previews_dir, sha256):
+    """Rutas (jpeg, webp) de la miniatura de un archivo según su hash."""
+    base = os.path.join(previews_dir, sha256[:2], sha256)
+    return base + ".jpg", base + ".webp"
+
+
+def make_preview(source, sha256, mime_type, previews_dir):
+    """
+    Genera la miniatura de una foto o el fotograma de portada de un video.
+    Devuelve (ruta_jpeg, ruta_webp o None), o (None, None) si el archivo
+    no tiene vista previa posible.
+    """
+    jpeg_path, webp_path = preview_paths(previews_dir, sha256)
+    if os.path.exists(jpeg_path):
+        return jpeg_path, webp_path if os.path.exists(webp_path) else None
+
+    if not mime_type or mime_type == "application/octet-stream":
+        mime_type = mimetypes.guess_type(source)[0] or ""
+
+    if mime_type.startswith("image/"):
+        with Image.open(source) as img:
+            return _save_preview(img, jpeg_path, webp_path)
+
+    if mime_type.startswith("video/"):
+        return _video_poster(source, jpeg_path, webp_path)
+
+    return None, None
+
+
+def _save_preview(img, jpeg_path, webp_path):
+    """Reduce la imagen y la guarda en JPEG (y WebP si Pillow lo soporta)."""
+    img = ImageOps.exif_transpose(img)
+    img.thumbnail(THUMBNAIL_SIZE)
+    img = img.convert("RGB")
+    os.makedirs(os.path.dirname(jpeg_path), exist_ok=True)
+
+    if features.check("webp"):
+        _atomic_save(img, webp_path, "WEBP", quality=75)
+    else:
+        webp_path = None
+
+    # El JPEG va al final: su existencia indica que la vista previa está lista
+    _atomic_save(img, jpeg_path, "JPEG", quality=80, progressive=True)
+    return jpeg_path, webp_path
+
+
+def _atomic_save(img, path, fmt, **options):
+    """Escribe en un temporal y renombra, para no servir archivos a medias."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as out:
+            img.save(out, fmt, **options)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _video_poster(source, jpeg_path, webp_path):
+    """Saca un fotograma con ffmpeg (si está instalado) y lo reduce."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None, None
+
+    fd, frame_path = tempfile.mkstemp(suffix=".jpg")
+    os.close(fd)
+    try:
+        # Primero al segundo 1 (evita negros al inicio); si el video es más
+        # corto, el primer fotograma.
+        for seek in (["-ss", "1"], []):
+            subprocess.run(
+                [ffmpeg, "-v", "error", "-y", *seek, "-i", source]
+                + ["-frames:v", "1", frame_path],
+                check=False,
+                timeout=POSTER_TIMEOUT,
+                stdin=subprocess.DEVNULL,
+            )
+            if os.path.getsize(frame_path) > 0:
+                with Image.open(frame_path) as img:
+                    return _save_preview(img, jpeg_path, webp_path)
+        return None, None
+    finally:
+        os.remove(frame_path)